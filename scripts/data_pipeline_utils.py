@@ -3,10 +3,17 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import threading
 import time
 from datetime import datetime, timezone
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 ROOT = Path(__file__).resolve().parents[1]
 DATA_DIR = ROOT / "data"
 RAW_DIR = DATA_DIR / "raw"
@@ -16,6 +23,14 @@ SPLITS_DIR = DATA_DIR / "splits"
 MANIFEST_DIR = DATA_DIR / "manifests"
 LOG_DIR = DATA_DIR / "logs"
 
+_PATH_LOCKS: dict[Path, threading.Lock] = {}
+_PATH_LOCKS_GUARD = threading.Lock()
+
+
+def path_lock(path: Path) -> threading.Lock:
+    with _PATH_LOCKS_GUARD:
+        return _PATH_LOCKS.setdefault(path.resolve(), threading.Lock())
+
 
 def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
@@ -28,12 +43,17 @@ def now_utc() -> str:
 def read_json(path: Path) -> dict:
     if not path.exists():
         return {}
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
 
 
 def write_json(path: Path, payload: dict) -> None:
     ensure_dir(path.parent)
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        return
     with path.open("w", encoding="utf-8") as handle:
         json.dump(payload, handle, indent=2, sort_keys=True)
 
@@ -44,9 +64,10 @@ def init_manifest(path: Path, default_payload: dict) -> None:
 
 
 def update_manifest(path: Path, updater) -> dict:
-    payload = read_json(path)
-    updated = updater(payload)
-    write_json(path, updated)
+    with path_lock(path):
+        payload = read_json(path)
+        updated = updater(payload)
+        write_json(path, updated)
     return updated
 
 
@@ -80,7 +101,7 @@ def iter_jsonl(path: Path):
 
 def write_jsonl(path: Path, records) -> None:
     ensure_dir(path.parent)
-    with path.open("a", encoding="utf-8") as handle:
+    with path_lock(path), path.open("a", encoding="utf-8") as handle:
         for record in records:
             handle.write(json.dumps(record, ensure_ascii=False) + "\n")
 
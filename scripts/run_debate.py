@@ -41,6 +41,44 @@ def main():
         action="store_true",
         help="Don't use domain-specific adapters"
     )
+    parser.add_argument(
+        "--batch-rounds",
+        action="store_true",
+        help="Generate pro and con of each round in a single batched call"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["hf", "vllm"],
+        default="hf",
+        help="Generation backend: transformers (hf) or in-process vLLM"
+    )
+    parser.add_argument(
+        "--merge-adapter",
+        action="store_true",
+        help="Merge the domain adapter into the base weights for faster decoding"
+    )
+    parser.add_argument(
+        "--stream-factcheck",
+        action="store_true",
+        help="Fact-check arguments sentence by sentence while they are generated"
+    )
+    parser.add_argument(
+        "--greedy",
+        action="store_true",
+        help="Decode greedily for deterministic arguments"
+    )
+    parser.add_argument(
+        "--draft-model",
+        type=Path,
+        default=None,
+        help="Small draft model (same tokenizer) for speculative decoding"
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=1,
+        help="Arguments sampled per turn; the best-supported one is kept"
+    )
     parser.add_argument(
         "--output-dir", "-o",
         type=Path,
@@ -59,11 +97,19 @@ def main():
     print(f"Use adapter: {not args.no_adapter}")
     print()
 
-    # Load model once (shared across agents)
-    print("--- Loading Model ---")
-    model, tokenizer = load_base_model()
-    print("Model loaded successfully")
-    print()
+    # Load model once (shared across agents); vLLM manages its own engine
+    model, tokenizer = None, None
+    if args.backend == "hf":
+        print("--- Loading Model ---")
+        model, tokenizer = load_base_model()
+        print("Model loaded successfully")
+        print()
+
+    draft_model = args.draft_model
+    if draft_model is not None and args.backend == "hf":
+        print(f"--- Loading Draft Model: {args.draft_model} ---")
+        draft_model, _ = load_base_model(model_path=args.draft_model)
+        print()
 
     # Create pipeline
     pipeline = DebatePipeline(
@@ -71,6 +117,13 @@ def main():
         model=model,
         tokenizer=tokenizer,
         use_adapter=not args.no_adapter,
+        batch_rounds=args.batch_rounds,
+        backend=args.backend,
+        merge_adapter=args.merge_adapter,
+        stream_factcheck=args.stream_factcheck,
+        do_sample=not args.greedy,
+        draft_model=draft_model,
+        n_samples=args.samples,
     )
 
     # Run debate
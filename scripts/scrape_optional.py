@@ -2,61 +2,121 @@ from __future__ import annotations
 
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
-from urllib.robotparser import RobotFileParser
 
 import requests
 import trafilatura
+from protego import Protego
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 sys.path.insert(0, str(SCRIPT_DIR))
 
 from data_pipeline_utils import (  # noqa: E402
     CORPUS_DIR,
+    DATA_DIR,
     LOG_DIR,
     MANIFEST_DIR,
     append_log,
     ensure_dir,
     init_manifest,
     now_utc,
+    read_json,
     sleep_with_jitter,
     stable_hash,
     truncate_text,
     update_manifest,
+    write_json,
     write_jsonl,
 )
 
 
 SCRAPE_LOG = LOG_DIR / "scrape.log"
 USER_AGENT = "debate-simulator/1.0 (+local academic project)"
+ROBOTS_TIMEOUT = 10
+ROBOTS_TTL_SECONDS = 24 * 60 * 60
+ROBOTS_CACHE_PATH = DATA_DIR / "cache" / "robots_cache.json"
+MAX_SCRAPE_WORKERS = 5
+
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = USER_AGENT
+# robots_url -> {"text", "etag", "last_modified", "fetched_at"}; persisted
+# across runs so revalidation can use conditional requests.
+_ROBOTS_CACHE: dict[str, dict] = {}
+_ROBOTS_PARSERS: dict[str, Protego] = {}
+
+
+def robots_text_for_response(response: requests.Response) -> str:
+    # Same status handling as urllib.robotparser: auth errors disallow
+    # everything, any other client error means there are no rules.
+    if response.status_code in (401, 403):
+        return "User-agent: *\nDisallow: /"
+    if 400 <= response.status_code < 500:
+        return ""
+    response.raise_for_status()
+    return response.text
+
+
+def fetch_robots(robots_url: str) -> Protego:
+    entry = _ROBOTS_CACHE.get(robots_url)
+    now = time.time()
+    if entry is None or now - entry.get("fetched_at", 0) >= ROBOTS_TTL_SECONDS:
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = _SESSION.get(robots_url, headers=headers, timeout=ROBOTS_TIMEOUT)
+        if entry is not None and response.status_code == 304:
+            entry["fetched_at"] = now
+        else:
+            entry = {
+                "text": robots_text_for_response(response),
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "fetched_at": now,
+            }
+            _ROBOTS_CACHE[robots_url] = entry
+            _ROBOTS_PARSERS.pop(robots_url, None)
+
+    parser = _ROBOTS_PARSERS.get(robots_url)
+    if parser is None:
+        parser = Protego.parse(entry["text"])
+        _ROBOTS_PARSERS[robots_url] = parser
+    return parser
 
 
 def can_fetch(url: str) -> tuple[bool, str]:
     parsed = urlparse(url)
     robots_url = f"{parsed.scheme}://{parsed.netloc}/robots.txt"
-    parser = RobotFileParser()
-    parser.set_url(robots_url)
     try:
-        parser.read()
+        parser = fetch_robots(robots_url)
     except Exception:
         return False, robots_url
-    return parser.can_fetch(USER_AGENT, url), robots_url
+    return parser.can_fetch(url, USER_AGENT), robots_url
+
+
+def scrape_version_entry(url: str, robots_allowed: bool, robots_url: str) -> dict:
+    return {
+        "url": url,
+        "robots_allowed": robots_allowed,
+        "robots_url": robots_url,
+        "timestamp_utc": now_utc(),
+    }
 
 
-def record_scrape_version(source_id: str, url: str, robots_allowed: bool, robots_url: str) -> None:
+def record_scrape_versions(source_id: str, entries: list[dict]) -> None:
+    if not entries:
+        return
+
     def updater(payload: dict) -> dict:
         sources = payload.get("sources", {})
         source_payload = sources.get(source_id, {})
         history = source_payload.get("scrapes", [])
-        history.append(
-            {
-                "url": url,
-                "robots_allowed": robots_allowed,
-                "robots_url": robots_url,
-                "timestamp_utc": now_utc(),
-            }
-        )
+        history.extend(entries)
         source_payload["scrapes"] = history
         sources[source_id] = source_payload
         payload["sources"] = sources
@@ -121,34 +181,40 @@ def scrape_domain(domain: str, urls: list[str], output_path: Path, source_id: st
     base_url = urls[0] if urls else f"https://{source_id}"
     record_source(source_id, domain, base_url)
     record_license(source_id, license_name)
-    for url in urls:
-        robots_allowed, robots_url = can_fetch(url)
-        record_scrape_version(source_id, url, robots_allowed, robots_url)
-        if not robots_allowed:
-            append_log(SCRAPE_LOG, f"robots disallow {url}")
-            sleep_with_jitter(1.0)
-            continue
-        append_log(SCRAPE_LOG, f"scrape {url}")
-        text, metadata = fetch_and_extract(url)
-        if not text:
-            append_log(SCRAPE_LOG, f"no text extracted {url}")
+    # Scrape history is flushed once per domain instead of rewriting
+    # versions.json for every URL.
+    version_entries: list[dict] = []
+    try:
+        for url in urls:
+            robots_allowed, robots_url = can_fetch(url)
+            version_entries.append(scrape_version_entry(url, robots_allowed, robots_url))
+            if not robots_allowed:
+                append_log(SCRAPE_LOG, f"robots disallow {url}")
+                sleep_with_jitter(1.0)
+                continue
+            append_log(SCRAPE_LOG, f"scrape {url}")
+            text, metadata = fetch_and_extract(url)
+            if not text:
+                append_log(SCRAPE_LOG, f"no text extracted {url}")
+                sleep_with_jitter(1.0)
+                continue
+            doc = {
+                "domain": domain,
+                "source": "web",
+                "source_id": source_id,
+                "source_url": url,
+                "license": license_name,
+                "doc_id": stable_hash(f"{source_id}:{url}"),
+                "title": metadata.get("title") if metadata else None,
+                "text": truncate_text(text, max_chars=8000),
+                "metadata": metadata,
+                "timestamp_utc": now_utc(),
+            }
+            write_jsonl(output_path, [doc])
+            append_log(SCRAPE_LOG, f"saved {url}")
             sleep_with_jitter(1.0)
-            continue
-        doc = {
-            "domain": domain,
-            "source": "web",
-            "source_id": source_id,
-            "source_url": url,
-            "license": license_name,
-            "doc_id": stable_hash(f"{source_id}:{url}"),
-            "title": metadata.get("title") if metadata else None,
-            "text": truncate_text(text, max_chars=8000),
-            "metadata": metadata,
-            "timestamp_utc": now_utc(),
-        }
-        write_jsonl(output_path, [doc])
-        append_log(SCRAPE_LOG, f"saved {url}")
-        sleep_with_jitter(1.0)
+    finally:
+        record_scrape_versions(source_id, version_entries)
 
 
 def main() -> None:
@@ -209,7 +275,7 @@ def main() -> None:
         },
     ]
 
-    for payload in scrape_targets:
+    def scrape_target(payload: dict) -> None:
         output_path = CORPUS_DIR / f"{payload['domain']}_web.jsonl"
         scrape_domain(
             domain=payload["domain"],
@@ -219,6 +285,15 @@ def main() -> None:
             license_name=payload["license"],
         )
 
+    _ROBOTS_CACHE.update(read_json(ROBOTS_CACHE_PATH))
+    # Each target is a distinct host, so their network waits can overlap.
+    # Manifest and corpus writes are serialized per path in data_pipeline_utils.
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_SCRAPE_WORKERS) as executor:
+            list(executor.map(scrape_target, scrape_targets))
+    finally:
+        write_json(ROBOTS_CACHE_PATH, _ROBOTS_CACHE)
+
 
 if __name__ == "__main__":
     main()
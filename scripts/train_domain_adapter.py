@@ -10,6 +10,7 @@ from __future__ import annotations
 import argparse
 import hashlib
 import json
+import os
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -29,12 +30,15 @@ from src.utils.model_loader import (  # noqa: E402
     prepare_model_for_training,
     BASE_MODEL_PATH,
     ADAPTERS_PATH,
+    LORA_TARGET_MODULES,
 )
 from src.train.dataset import (  # noqa: E402
+    iter_jsonl_records,
     prepare_sft_dataset_for_training,
 )
 from src.train.trainer import (  # noqa: E402
     TrainingMetrics,
+    configure_torch_compile,
     get_training_arguments,
     create_trainer,
     save_training_report,
@@ -58,44 +62,66 @@ def assign_split(text: str) -> str:
     return "test"
 
 
+def iter_split_records(
+    path: str,
+    mtime_ns: int = 0,
+    max_train: Optional[int] = None,
+    max_val: Optional[int] = None,
+    max_test: Optional[int] = None,
+):
+    # Records past a split's limit are dropped here, and reading stops once
+    # every split is full, so capped runs don't encode the whole file.
+    limits = {"train": max_train, "val": max_val, "test": max_test}
+    counts = dict.fromkeys(limits, 0)
+    for record in iter_jsonl_records(path, mtime_ns):
+        text = record.get("text")
+        if not text:
+            record["_split"] = "skipped"
+            yield record
+            continue
+        split = assign_split(text)
+        limit = limits[split]
+        if limit is not None and counts[split] >= limit:
+            continue
+        counts[split] += 1
+        record["_split"] = split
+        yield record
+        if all(
+            limits[name] is not None and counts[name] >= limits[name]
+            for name in limits
+        ):
+            return
+
+
 def load_sft_splits(
     path: Path,
     max_train: Optional[int],
     max_val: Optional[int],
     max_test: Optional[int],
 ) -> tuple[Dataset, Dataset, Dataset, dict]:
-    splits = {"train": [], "val": [], "test": []}
-    counts = {"train": 0, "val": 0, "test": 0, "skipped": 0}
-    limits = {"train": max_train, "val": max_val, "test": max_test}
-
-    with path.open("r", encoding="utf-8") as handle:
-        for line in handle:
-            line = line.strip()
-            if not line:
-                continue
-            record = json.loads(line)
-            text = record.get("text")
-            if not text:
-                counts["skipped"] += 1
-                continue
-            split = assign_split(text)
-            limit = limits.get(split)
-            if limit is not None and counts[split] >= limit:
-                continue
-            splits[split].append(record)
-            counts[split] += 1
-            if all(
-                limits[name] is not None and counts[name] >= limits[name]
-                for name in ["train", "val", "test"]
-            ):
-                break
-
-    return (
-        Dataset.from_list(splits["train"]),
-        Dataset.from_list(splits["val"]),
-        Dataset.from_list(splits["test"]),
-        counts,
+    # Stream the file into Arrow once, then carve out the splits by index
+    # instead of building intermediate Python lists per split.
+    dataset = Dataset.from_generator(
+        iter_split_records,
+        gen_kwargs={
+            "path": str(path),
+            "mtime_ns": path.stat().st_mtime_ns,
+            "max_train": max_train,
+            "max_val": max_val,
+            "max_test": max_test,
+        },
     )
+    indices = {"train": [], "val": [], "test": [], "skipped": []}
+    for idx, split in enumerate(dataset["_split"]):
+        indices[split].append(idx)
+
+    dataset = dataset.remove_columns("_split")
+    splits = {name: dataset.select(indices[name]) for name in ("train", "val", "test")}
+
+    counts = {name: len(splits[name]) for name in splits}
+    counts["skipped"] = len(indices["skipped"])
+
+    return splits["train"], splits["val"], splits["test"], counts
 
 
 def parse_args() -> argparse.Namespace:
@@ -106,14 +132,38 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--max-val-samples", type=int, default=None)
     parser.add_argument("--max-test-samples", type=int, default=None)
     parser.add_argument("--epochs", type=int, default=3)
-    parser.add_argument("--batch-size", type=int, default=2)
-    parser.add_argument("--grad-accum", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--grad-accum", type=int, default=4)
     parser.add_argument("--learning-rate", type=float, default=2e-4)
     parser.add_argument("--max-seq-length", type=int, default=512)
+    parser.add_argument(
+        "--no-packing",
+        dest="packing",
+        action="store_false",
+        help="Pad each example to --max-seq-length instead of packing",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="DataLoader worker processes (use 0 if multiprocessing is restricted)",
+    )
+    parser.add_argument(
+        "--no-compile",
+        dest="torch_compile",
+        action="store_false",
+        help="Train in eager mode instead of using torch.compile",
+    )
     parser.add_argument("--lora-r", type=int, default=16)
     parser.add_argument("--lora-alpha", type=int, default=32)
     parser.add_argument("--lora-dropout", type=float, default=0.05)
-    parser.add_argument("--target-modules", default="q_proj,v_proj")
+    parser.add_argument("--target-modules", default=",".join(LORA_TARGET_MODULES))
+    parser.add_argument(
+        "--no-rslora",
+        dest="use_rslora",
+        action="store_false",
+        help="Use classic alpha/r LoRA scaling instead of rank-stabilized alpha/sqrt(r)",
+    )
     return parser.parse_args()
 
 
@@ -141,11 +191,14 @@ def main() -> int:
         "lora_alpha": args.lora_alpha,
         "lora_dropout": args.lora_dropout,
         "target_modules": [m.strip() for m in args.target_modules.split(",") if m.strip()],
+        "use_rslora": args.use_rslora,
         "num_epochs": args.epochs,
         "batch_size": args.batch_size,
         "gradient_accumulation_steps": args.grad_accum,
         "learning_rate": args.learning_rate,
         "max_seq_length": args.max_seq_length,
+        "packing": args.packing,
+        "dataloader_num_workers": args.num_workers,
         "max_train_samples": args.max_train_samples,
         "max_val_samples": args.max_val_samples,
         "max_test_samples": args.max_test_samples,
@@ -183,7 +236,11 @@ def main() -> int:
     print(f"GPU memory: {model_info.get('gpu_memory_allocated_gb', 0):.2f} GB")
 
     print("\n--- Preparing Model for QLoRA ---")
-    model = prepare_model_for_kbit_training(model)
+    model = prepare_model_for_kbit_training(
+        model,
+        use_gradient_checkpointing=True,
+        gradient_checkpointing_kwargs={"use_reentrant": False},
+    )
 
     print("\n--- Applying LoRA Adapters ---")
     lora_config = get_lora_config(
@@ -191,6 +248,7 @@ def main() -> int:
         lora_alpha=args.lora_alpha,
         lora_dropout=args.lora_dropout,
         target_modules=training_config["target_modules"],
+        use_rslora=args.use_rslora,
     )
     model = prepare_model_for_training(model, lora_config)
 
@@ -199,11 +257,13 @@ def main() -> int:
         train_data,
         tokenizer,
         max_length=args.max_seq_length,
+        packing=args.packing,
     )
     val_dataset = prepare_sft_dataset_for_training(
         val_data,
         tokenizer,
         max_length=args.max_seq_length,
+        packing=args.packing,
     )
     test_dataset = None
     if len(test_data) > 0:
@@ -211,9 +271,11 @@ def main() -> int:
             test_data,
             tokenizer,
             max_length=args.max_seq_length,
+            packing=args.packing,
         )
 
     print("\n--- Configuring Training ---")
+    use_compile = args.torch_compile and configure_torch_compile()
     training_args = get_training_arguments(
         output_dir=run_dir / "checkpoints",
         num_epochs=args.epochs,
@@ -224,8 +286,11 @@ def main() -> int:
         logging_steps=5,
         eval_steps=20,
         save_steps=40,
-        dataloader_num_workers=0,
-        dataloader_pin_memory=False,
+        dataloader_num_workers=args.num_workers,
+        dataloader_pin_memory=torch.cuda.is_available(),
+        dataloader_persistent_workers=True,
+        dataloader_prefetch_factor=2,
+        torch_compile=use_compile,
     )
 
     metrics = TrainingMetrics()
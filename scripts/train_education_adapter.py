@@ -6,7 +6,7 @@ Trains a LoRA adapter on the education debate dataset using 4-bit quantization.
 
 Features:
 - Freezes base model weights
-- Trains LoRA adapters (q_proj, v_proj)
+- Trains rank-stabilized LoRA adapters on all linear projections
 - Logs training/validation loss and perplexity
 - Saves adapter and training artifacts
 
@@ -37,6 +37,7 @@ from src.utils.model_loader import (
     prepare_model_for_training,
     BASE_MODEL_PATH,
     ADAPTERS_PATH,
+    LORA_TARGET_MODULES,
 )
 from src.train.dataset import (
     load_debate_jsonl,
@@ -44,6 +45,7 @@ from src.train.dataset import (
 )
 from src.train.trainer import (
     TrainingMetrics,
+    configure_torch_compile,
     get_training_arguments,
     create_trainer,
     save_training_report,
@@ -63,10 +65,11 @@ TRAINING_CONFIG = {
     "lora_r": 16,
     "lora_alpha": 32,
     "lora_dropout": 0.05,
-    "target_modules": ["q_proj", "v_proj"],
+    "target_modules": LORA_TARGET_MODULES,
+    "use_rslora": True,
     "num_epochs": 3,
-    "batch_size": 2,
-    "gradient_accumulation_steps": 8,
+    "batch_size": 4,
+    "gradient_accumulation_steps": 4,
     "learning_rate": 2e-4,
     "warmup_ratio": 0.1,
     "max_seq_length": 512,
@@ -113,7 +116,11 @@ def main():
 
     # Step 3: Prepare model for k-bit training
     print("\n--- Preparing Model for QLoRA ---")
-    model = prepare_model_for_kbit_training(model)
+    model = prepare_model_for_kbit_training(
+        model,
+        use_gradient_checkpointing=True,
+        gradient_checkpointing_kwargs={"use_reentrant": False},
+    )
 
     # Step 4: Apply LoRA adapters
     print("\n--- Applying LoRA Adapters ---")
@@ -122,6 +129,7 @@ def main():
         lora_alpha=TRAINING_CONFIG["lora_alpha"],
         lora_dropout=TRAINING_CONFIG["lora_dropout"],
         target_modules=TRAINING_CONFIG["target_modules"],
+        use_rslora=TRAINING_CONFIG["use_rslora"],
     )
     model = prepare_model_for_training(model, lora_config)
 
@@ -140,6 +148,7 @@ def main():
 
     # Step 6: Setup training
     print("\n--- Configuring Training ---")
+    use_compile = configure_torch_compile()
     training_args = get_training_arguments(
         output_dir=run_dir / "checkpoints",
         num_epochs=TRAINING_CONFIG["num_epochs"],
@@ -150,6 +159,7 @@ def main():
         logging_steps=TRAINING_CONFIG["logging_steps"],
         eval_steps=TRAINING_CONFIG["eval_steps"],
         save_steps=TRAINING_CONFIG["save_steps"],
+        torch_compile=use_compile,
     )
 
     metrics = TrainingMetrics()
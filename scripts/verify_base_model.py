@@ -25,6 +25,8 @@ from transformers import GenerationConfig
 
 from src.utils.model_loader import (
     load_base_model,
+    get_attn_implementation,
+    get_compute_dtype,
     get_model_info,
     BASE_MODEL_PATH,
 )
@@ -85,6 +87,14 @@ def verify_model_loading() -> dict | None:
         print(f"  Model type: {info['model_type']}")
         print(f"  Device: {info['device']}")
         print(f"  Dtype: {info['dtype']}")
+        print(f"  4-bit compute dtype: {info.get('compute_dtype')}")
+        expected_dtype = str(get_compute_dtype())
+        assert info["dtype"] == expected_dtype, (
+            f"expected {expected_dtype} weights, got {info['dtype']}"
+        )
+        assert info.get("compute_dtype") == expected_dtype, (
+            f"expected {expected_dtype} 4-bit compute dtype, got {info.get('compute_dtype')}"
+        )
         print(f"  Total parameters: {info['num_parameters']:,}")
         print(f"  GPU memory allocated: {info['gpu_memory_allocated_gb']:.2f} GB")
         print(f"  GPU memory reserved: {info['gpu_memory_reserved_gb']:.2f} GB")
@@ -112,6 +122,13 @@ Argument:"""
     print(f"Prompt: {prompt[:100]}...")
 
     try:
+        # FlashAttention-2 when installed, otherwise SDPA
+        attn_implementation = model.config._attn_implementation
+        print(f"Attention implementation: {attn_implementation}")
+        assert attn_implementation == get_attn_implementation(), (
+            f"expected {get_attn_implementation()} attention, got {attn_implementation}"
+        )
+
         inputs = tokenizer(prompt, return_tensors="pt").to(model.device)
 
         generation_config = GenerationConfig(
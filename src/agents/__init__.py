@@ -2,7 +2,7 @@
 from src.agents.base import Agent, AgentState, DebateContext
 from src.agents.router import DomainRouterAgent
 from src.agents.research import ResearchAgent
-from src.agents.debater import DebaterAgent
+from src.agents.debater import DebaterAgent, DebateRoundAgent
 from src.agents.factcheck import FactCheckAgent
 from src.agents.judge import JudgeAgent
 from src.agents.logger import LoggerAgent
@@ -14,6 +14,7 @@ __all__ = [
     "DomainRouterAgent",
     "ResearchAgent",
     "DebaterAgent",
+    "DebateRoundAgent",
     "FactCheckAgent",
     "JudgeAgent",
     "LoggerAgent",
@@ -5,7 +5,9 @@ Implements a state machine architecture where each agent
 processes and transforms the debate context.
 """
 
+import time
 from abc import ABC, abstractmethod
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -26,7 +28,7 @@ class AgentState(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class DebateTurn:
     """Single turn in a debate."""
     stance: str  # "pro" or "con"
@@ -35,8 +37,18 @@ class DebateTurn:
     fact_check_result: dict | None = None
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
 
+    def to_dict(self) -> dict:
+        """JSON-ready representation used in debate artifacts."""
+        return {
+            "stance": self.stance,
+            "argument": self.argument,
+            "sources": self.sources,
+            "fact_check": self.fact_check_result,
+            "timestamp": self.timestamp,
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class JudgeScore:
     """Structured scoring from the judge."""
     pro_score: float  # 0-10
@@ -46,7 +58,7 @@ class JudgeScore:
     criteria_scores: dict[str, dict[str, float]] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class DebateContext:
     """
     Shared context passed between agents in the pipeline.
@@ -77,16 +89,22 @@ class DebateContext:
 
     # Metrics and logging
     metrics: dict = field(default_factory=dict)
-    agent_logs: list[dict] = field(default_factory=list)
+    agent_logs: deque[dict] = field(default_factory=deque)
+    verbose: bool = False  # Record agent actions in agent_logs
 
     # Timestamps
     started_at: str = field(default_factory=lambda: datetime.now().isoformat())
     completed_at: str | None = None
 
     def log_agent_action(self, agent_name: str, action: str, details: dict | None = None):
-        """Log an agent's action for debugging and metrics."""
+        """
+        Log an agent's action for debugging and metrics.
+
+        The timestamp is kept as epoch nanoseconds; LoggerAgent formats
+        it when the logs are written out.
+        """
         self.agent_logs.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "agent": agent_name,
             "action": action,
             "state": self.current_state.value,
@@ -122,5 +140,7 @@ class Agent(ABC):
         pass
 
     def _log(self, context: DebateContext, action: str, details: dict | None = None):
-        """Helper to log agent actions."""
+        """Helper to log agent actions (only when the context is verbose)."""
+        if not context.verbose:
+            return
         context.log_agent_action(self.name, action, details)
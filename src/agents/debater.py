@@ -2,13 +2,25 @@
 Debater Agent - Generates debate arguments using LLM with adapters.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from pathlib import Path
 import torch
-from transformers import GenerationConfig
+from transformers import GenerationConfig, TextIteratorStreamer
 from peft import PeftModel
 
 from src.agents.base import Agent, AgentState, DebateContext, DebateTurn
+from src.agents.factcheck import FactCheckAgent
 from src.utils.model_loader import load_base_model, ADAPTERS_PATH
+from src.utils.vllm_loader import get_vllm_engine, get_lora_request
+
+# Don't call torch.cuda.empty_cache() after generate() or per turn: it
+# walks every cached allocator block and forces later turns to allocate
+# from the driver again, which slows decoding once the allocation
+# pattern is steady. Memory freed by adapter switches is returned via
+# expandable segments (see PYTORCH_CUDA_ALLOC_CONF in model_loader);
+# if a caller really needs to release the cache, do it once after the
+# debate has been judged.
 
 
 class DebaterAgent(Agent):
@@ -25,6 +37,12 @@ class DebaterAgent(Agent):
         model=None,
         tokenizer=None,
         use_adapter: bool = True,
+        backend: str = "hf",
+        merge_adapter: bool = False,
+        factcheck: FactCheckAgent | None = None,
+        do_sample: bool = True,
+        draft_model=None,
+        n_samples: int = 1,
     ):
         """
         Initialize debater agent.
@@ -34,16 +52,51 @@ class DebaterAgent(Agent):
             model: Pre-loaded model (optional, will load if not provided)
             tokenizer: Pre-loaded tokenizer
             use_adapter: Whether to use domain adapters
+            backend: "hf" for transformers generate, "vllm" for the shared
+                vLLM engine (PagedAttention + prefix caching)
+            merge_adapter: Fold the domain adapter into the base weights
+                (inference only); switching domain then reloads the base model
+            factcheck: Fact-checker to run on sentences as they stream out
+                of generate (hf backend), overlapping checking with decoding
+            do_sample: Sample with temperature/top-p; False decodes greedily
+                for deterministic arguments
+            draft_model: Small draft model for speculative decoding that
+                shares the tokenizer: a loaded model for hf (passed to
+                generate as assistant_model), a model path for vllm
+            n_samples: Arguments sampled per turn; with more than one, the
+                candidate best supported by the passages is kept
         """
         super().__init__(f"Debater_{stance.upper()}")
+        if backend not in ("hf", "vllm"):
+            raise ValueError(f"Invalid backend: {backend}. Use 'hf' or 'vllm'.")
+        if n_samples > 1 and not do_sample:
+            raise ValueError("n_samples > 1 requires do_sample=True.")
         self.stance = stance.lower()
         self.use_adapter = use_adapter
+        self.backend = backend
+        self.merge_adapter = merge_adapter
+        self.factcheck = factcheck
+        self.do_sample = do_sample
+        self.draft_model = draft_model
+        self.n_samples = n_samples
         self._model = model
         self._tokenizer = tokenizer
         self._loaded_adapter = None
+        self._loaded_adapters: set[str] = set()
+        self._llm = None
+        self._lora_request = None
+        self._prefix_text: str | None = None
+        self._prefix_ids: torch.Tensor | None = None
+        self._prefix_kv = None
+        self._copy_stream = None
 
     def _ensure_model_loaded(self):
         """Load model if not already loaded."""
+        if self.backend == "vllm":
+            if self._llm is None:
+                self._llm = get_vllm_engine(speculative_model=self.draft_model)
+            return
+
         if self._model is None:
             self._model, self._tokenizer = load_base_model()
 
@@ -55,68 +108,378 @@ class DebaterAgent(Agent):
         if self._loaded_adapter == domain:
             return
 
+        if self.backend == "vllm":
+            # vLLM applies the adapter per request; nothing to rebuild
+            self._lora_request = get_lora_request(domain)
+            self._loaded_adapter = domain
+            return
+
+        # Cached prefix activations belong to the previous adapter
+        self._prefix_kv = None
+
         adapter_path = ADAPTERS_PATH / domain
-        if adapter_path.exists():
-            # Reload base model and apply adapter
-            if isinstance(self._model, PeftModel):
-                # Unload current adapter
-                self._model = self._model.base_model.model
+        if adapter_path.exists() and self.merge_adapter:
+            self._merge_adapter(domain, adapter_path)
+        elif adapter_path.exists():
+            # Each adapter is read from disk once and stays resident;
+            # switching domains only changes the active adapter.
+            if not isinstance(self._model, PeftModel):
+                self._model = PeftModel.from_pretrained(
+                    self._model, adapter_path, adapter_name=domain
+                )
+                self._loaded_adapters.add(domain)
+            elif domain not in self._loaded_adapters:
+                self._model.load_adapter(adapter_path, adapter_name=domain)
+                self._loaded_adapters.add(domain)
+
+            self._model.set_adapter(domain)
+            self._loaded_adapter = domain
 
-            self._model = PeftModel.from_pretrained(self._model, adapter_path)
+    def _merge_adapter(self, domain: str, adapter_path: Path):
+        """Merge the adapter's LoRA deltas into the base linear weights."""
+        merged = getattr(self._model, "merged_adapter", None)
+        if merged == domain:
+            # Another debater sharing this model already merged it
             self._loaded_adapter = domain
+            return
 
-    def _format_prompt(
+        if merged is not None:
+            # Merged weights can't be unmerged exactly; start from a fresh base
+            self._model, self._tokenizer = load_base_model()
+
+        model = PeftModel.from_pretrained(self._model, adapter_path)
+        self._model = model.merge_and_unload()
+        self._model.merged_adapter = domain
+        self._loaded_adapter = domain
+
+    def _format_prompt_parts(
         self,
         topic: str,
         domain: str,
         context: str,
         previous_arguments: list[str] | None = None,
-    ) -> str:
-        """Format the prompt for debate generation."""
+    ) -> tuple[str, str]:
+        """
+        Format the prompt as a (prefix, suffix) pair.
+
+        The prefix (system message, topic, background) is identical for both
+        stances and every round of a debate, so it is tokenized once and can
+        be served from the engine's prefix cache. Only the suffix (previous
+        arguments + stance instruction) changes per turn.
+        """
         system_msg = f"""You are an expert debate assistant specializing in {domain}.
 Generate compelling, well-reasoned arguments backed by evidence.
 Be concise but thorough. Use logical reasoning and cite relevant facts."""
 
+        prefix = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+
+{system_msg}<|eot_id|><|start_header_id|>user<|end_header_id|>
+
+Topic: {topic}
+
+Background information:
+{context}
+"""
+
         previous_context = ""
         if previous_arguments:
-            previous_context = "\n\nPrevious arguments in this debate:\n"
+            previous_context = "\nPrevious arguments in this debate:\n"
             for i, arg in enumerate(previous_arguments, 1):
                 previous_context += f"{i}. {arg}\n"
 
-        user_msg = f"""Topic: {topic}
+        suffix = f"""{previous_context}
 Stance: {self.stance.upper()} ({"in favor" if self.stance == "pro" else "against"})
+Generate a single, persuasive argument for this position. Focus on one main point with supporting reasoning.<|eot_id|><|start_header_id|>assistant<|end_header_id|>
 
-Background information:
-{context}
-{previous_context}
-Generate a single, persuasive argument for this position. Focus on one main point with supporting reasoning."""
-
-        prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-{system_msg}<|eot_id|><|start_header_id|>user<|end_header_id|>
+"""
+        return prefix, suffix
 
-{user_msg}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
+    def _format_prompt(
+        self,
+        topic: str,
+        domain: str,
+        context: str,
+        previous_arguments: list[str] | None = None,
+    ) -> str:
+        """Format the prompt for debate generation."""
+        return "".join(self._format_prompt_parts(topic, domain, context, previous_arguments))
+
+    def _encode_prefix(self, prefix: str) -> torch.Tensor:
+        """Tokenize the shared prompt prefix, reusing the last result."""
+        if prefix != self._prefix_text:
+            # The prompt already contains <|begin_of_text|>
+            self._prefix_ids = self._tokenizer(
+                prefix,
+                return_tensors="pt",
+                add_special_tokens=False,
+            ).input_ids
+            self._prefix_text = prefix
+            self._prefix_kv = None
+        return self._prefix_ids
+
+    def _to_device(self, tensor: torch.Tensor) -> torch.Tensor:
+        """
+        Copy a host tensor to the model device.
 
-"""
-        return prompt
+        On CUDA the tensor is pinned and copied asynchronously on a side
+        stream, so the transfer doesn't wait behind the previous decode.
+        """
+        device = self._model.device
+        if device.type != "cuda":
+            return tensor.to(device)
+
+        if self._copy_stream is None:
+            self._copy_stream = torch.cuda.Stream(device=device)
+        with torch.cuda.stream(self._copy_stream):
+            result = tensor.pin_memory().to(device, non_blocking=True)
+        compute_stream = torch.cuda.current_stream(device)
+        compute_stream.wait_stream(self._copy_stream)
+        result.record_stream(compute_stream)
+        return result
+
+    def _get_prefix_kv(self, prefix_ids: torch.Tensor):
+        """Run the shared prefix through the model once and cache its KV."""
+        if self._prefix_kv is None:
+            with torch.no_grad():
+                self._prefix_kv = self._model(
+                    input_ids=self._to_device(prefix_ids),
+                    use_cache=True,
+                ).past_key_values
+        return self._prefix_kv
+
+    def _generation_config(
+        self,
+        max_new_tokens: int,
+        temperature: float,
+    ) -> GenerationConfig:
+        """Sampling or greedy generation settings for this debater."""
+        if self.do_sample:
+            sampling = {"do_sample": True, "temperature": temperature, "top_p": 0.9}
+        else:
+            sampling = {"do_sample": False}
+        return GenerationConfig(
+            max_new_tokens=max_new_tokens,
+            pad_token_id=self._tokenizer.pad_token_id,
+            eos_token_id=self._tokenizer.eos_token_id,
+            **sampling,
+        )
 
     def _generate(
         self,
-        prompt: str,
+        prefix: str,
+        suffix: str = "",
         max_new_tokens: int = 200,
         temperature: float = 0.7,
+        streamer: TextIteratorStreamer | None = None,
     ) -> str:
-        """Generate text from prompt."""
-        inputs = self._tokenizer(prompt, return_tensors="pt").to(self._model.device)
+        """Generate text from a prompt given as a cached prefix and a suffix."""
+        return self._generate_samples(
+            prefix, suffix, 1, max_new_tokens, temperature, streamer
+        )[0]
 
-        generation_config = GenerationConfig(
-            max_new_tokens=max_new_tokens,
-            temperature=temperature,
+    def _generate_samples(
+        self,
+        prefix: str,
+        suffix: str = "",
+        n: int = 1,
+        max_new_tokens: int = 200,
+        temperature: float = 0.7,
+        streamer: TextIteratorStreamer | None = None,
+    ) -> list[str]:
+        """
+        Generate n samples for one prompt in a single generate call.
+
+        The n sequences are decoded as one batch (vLLM also shares the
+        prompt prefill between them).
+        """
+        if self.backend == "vllm":
+            return self._generate_vllm([prefix + suffix], max_new_tokens, temperature, n=n)
+
+        prefix_ids = self._encode_prefix(prefix)
+        suffix_ids = self._tokenizer(
+            suffix,
+            return_tensors="pt",
+            add_special_tokens=False,
+        ).input_ids
+        input_ids = self._to_device(torch.cat([prefix_ids, suffix_ids], dim=1))
+        attention_mask = torch.ones_like(input_ids)
+        # generate() extends the cache in place, so each turn gets a copy;
+        # only the suffix tokens are prefilled. generate() needs at least
+        # one uncached token, so an empty suffix falls back to a full prefill.
+        # Assisted generation manages the caches of both models itself, and
+        # both it and the cached prefix assume a single returned sequence.
+        single = n == 1
+        draft_model = self.draft_model if single else None
+        past_key_values = None
+        if single and suffix_ids.shape[1] > 0 and draft_model is None:
+            past_key_values = deepcopy(self._get_prefix_kv(prefix_ids))
+
+        generation_config = self._generation_config(max_new_tokens, temperature)
+        generation_config.num_return_sequences = n
+
+        with torch.no_grad():
+            outputs = self._model.generate(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                past_key_values=past_key_values,
+                use_cache=True,
+                generation_config=generation_config,
+                streamer=streamer,
+                # The draft proposes tokens that one target forward verifies
+                assistant_model=draft_model,
+            )
+
+        # Keep only the newly generated tokens (the assistant's response)
+        return [
+            text.strip()
+            for text in self._tokenizer.batch_decode(
+                outputs[:, input_ids.shape[1]:],
+                skip_special_tokens=True,
+            )
+        ]
+
+    def _generate_and_check(
+        self,
+        prefix: str,
+        suffix: str,
+        sources: list[str],
+        passages: list[dict],
+    ) -> tuple[str, dict]:
+        """
+        Generate an argument while fact-checking it sentence by sentence.
+
+        generate() runs on a worker thread and streams text back; each
+        finished sentence is scored against the passages while decoding
+        continues, so only the trailing sentence is checked afterwards.
+        """
+        streamer = TextIteratorStreamer(
+            self._tokenizer,
+            skip_prompt=True,
+            skip_special_tokens=True,
+        )
+
+        def run_generate() -> str:
+            try:
+                return self._generate(prefix, suffix, streamer=streamer)
+            except BaseException:
+                # Unblock the consumer loop before propagating the error
+                streamer.end()
+                raise
+
+        passage_index = self.factcheck.fit_passages(passages)
+        claim_futures = []
+        pending = ""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            generation = executor.submit(run_generate)
+            for chunk in streamer:
+                claims, pending = self.factcheck.split_complete_claims(pending + chunk)
+                if claims:
+                    claim_futures.append(executor.submit(
+                        self.factcheck.score_claims, claims, passage_index
+                    ))
+            argument = generation.result()
+
+        claim_scores = [score for future in claim_futures for score in future.result()]
+        fact_check_result = self.factcheck.check_argument(
+            argument,
+            sources,
+            passages,
+            passage_index=passage_index,
+            claim_scores=claim_scores,
+        )
+        return argument, fact_check_result
+
+    def _generate_best_of_n(
+        self,
+        prefix: str,
+        suffix: str,
+        sources: list[str],
+        passages: list[dict],
+    ) -> tuple[str, dict]:
+        """Sample n_samples arguments and keep the best-supported one."""
+        candidates = self._generate_samples(prefix, suffix, self.n_samples)
+
+        factcheck = self.factcheck or FactCheckAgent()
+        passage_index = factcheck.fit_passages(passages)
+        results = [
+            factcheck.check_argument(
+                candidate, sources, passages, passage_index=passage_index
+            )
+            for candidate in candidates
+        ]
+        best = max(
+            range(len(candidates)),
+            key=lambda i: results[i]["faithfulness_score"],
+        )
+        return candidates[best], results[best]
+
+    def _generate_vllm(
+        self,
+        prompts: list[str],
+        max_new_tokens: int = 200,
+        temperature: float = 0.7,
+        n: int = 1,
+    ) -> list[str]:
+        """
+        Generate with the shared vLLM engine (one request per prompt).
+
+        Returns the n samples of every prompt, flattened in prompt order.
+        """
+        from vllm import SamplingParams
+
+        sampling_params = SamplingParams(
+            # Temperature 0 is greedy decoding in vLLM
+            temperature=temperature if self.do_sample else 0.0,
             top_p=0.9,
-            do_sample=True,
-            pad_token_id=self._tokenizer.pad_token_id,
-            eos_token_id=self._tokenizer.eos_token_id,
+            max_tokens=max_new_tokens,
+            n=n,
         )
+        outputs = self._llm.generate(
+            prompts,
+            sampling_params,
+            lora_request=self._lora_request,
+            use_tqdm=False,
+        )
+        return [
+            sample.text.strip()
+            for output in outputs
+            for sample in output.outputs
+        ]
+
+    def generate_batch(
+        self,
+        prompts: list[str],
+        max_new_tokens: int = 200,
+        temperature: float = 0.7,
+    ) -> list[str]:
+        """
+        Generate responses for several prompts in one model.generate call.
+
+        Prompts are left-padded so every sequence ends at the same position
+        and the new tokens can be sliced off together.
+        """
+        if self.backend == "vllm":
+            return self._generate_vllm(prompts, max_new_tokens, temperature)
+
+        padding_side = self._tokenizer.padding_side
+        self._tokenizer.padding_side = "left"
+        try:
+            encoded = self._tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True,
+                add_special_tokens=False,
+            )
+        finally:
+            self._tokenizer.padding_side = padding_side
+        inputs = {
+            "input_ids": self._to_device(encoded["input_ids"]),
+            "attention_mask": self._to_device(encoded["attention_mask"]),
+        }
+
+        # Assisted generation only supports a batch of one, so batched
+        # rounds decode without the draft model.
+        generation_config = self._generation_config(max_new_tokens, temperature)
 
         with torch.no_grad():
             outputs = self._model.generate(
@@ -124,18 +487,50 @@ Generate a single, persuasive argument for this position. Focus on one main poin
                 generation_config=generation_config,
             )
 
-        full_response = self._tokenizer.decode(outputs[0], skip_special_tokens=True)
+        prompt_length = inputs["input_ids"].shape[1]
+        return [
+            text.strip()
+            for text in self._tokenizer.batch_decode(
+                outputs[:, prompt_length:],
+                skip_special_tokens=True,
+            )
+        ]
 
-        # Extract just the assistant's response
-        # Find the marker and take text after it
-        marker = "Focus on one main point with supporting reasoning."
-        if marker in full_response:
-            response = full_response.split(marker)[-1].strip()
-        else:
-            # Fallback: take last portion after prompt length
-            response = full_response[len(prompt):].strip()
+    def build_prompt(
+        self,
+        topic: str,
+        domain: str,
+        retrieved_passages: list[dict],
+        previous_arguments: list[str] | None = None,
+    ) -> str:
+        """Build the generation prompt from the research context."""
+        return "".join(
+            self.build_prompt_parts(topic, domain, retrieved_passages, previous_arguments)
+        )
 
-        return response
+    def build_prompt_parts(
+        self,
+        topic: str,
+        domain: str,
+        retrieved_passages: list[dict],
+        previous_arguments: list[str] | None = None,
+    ) -> tuple[str, str]:
+        """Build the (shared prefix, per-turn suffix) prompt pair."""
+        context = "\n".join(
+            f"- {p['text']}" for p in retrieved_passages[:3]
+        )
+        return self._format_prompt_parts(topic, domain, context, previous_arguments)
+
+    def make_turn(self, argument: str, retrieved_passages: list[dict]) -> DebateTurn:
+        """Wrap a generated argument in a DebateTurn with its sources."""
+        # Track which sources were used
+        sources = [p["source"] for p in retrieved_passages[:3]]
+
+        return DebateTurn(
+            stance=self.stance,
+            argument=argument,
+            sources=sources,
+        )
 
     def generate_argument(
         self,
@@ -159,22 +554,26 @@ Generate a single, persuasive argument for this position. Focus on one main poin
         self._ensure_model_loaded()
         self._load_adapter(domain)
 
-        # Build context from retrieved passages
-        context = "\n".join(
-            f"- {p['text']}" for p in retrieved_passages[:3]
+        prefix, suffix = self.build_prompt_parts(
+            topic, domain, retrieved_passages, previous_arguments
         )
+        if self.n_samples > 1:
+            turn = self.make_turn("", retrieved_passages)
+            turn.argument, turn.fact_check_result = self._generate_best_of_n(
+                prefix, suffix, turn.sources, retrieved_passages
+            )
+            return turn
 
-        prompt = self._format_prompt(topic, domain, context, previous_arguments)
-        argument = self._generate(prompt)
+        if self.factcheck is not None and self.backend == "hf":
+            turn = self.make_turn("", retrieved_passages)
+            turn.argument, turn.fact_check_result = self._generate_and_check(
+                prefix, suffix, turn.sources, retrieved_passages
+            )
+            return turn
 
-        # Track which sources were used
-        sources = [p["source"] for p in retrieved_passages[:3]]
+        argument = self._generate(prefix, suffix)
 
-        return DebateTurn(
-            stance=self.stance,
-            argument=argument,
-            sources=sources,
-        )
+        return self.make_turn(argument, retrieved_passages)
 
     def process(self, context: DebateContext) -> DebateContext:
         """Generate debate argument and update context."""
@@ -217,3 +616,63 @@ Generate a single, persuasive argument for this position. Focus on one main poin
         })
 
         return context
+
+
+class DebateRoundAgent(Agent):
+    """
+    Generates the pro and con arguments of a round in one batched call.
+
+    Both stances are decoded together, so each round costs one generate
+    call instead of two. Both sides only see arguments from earlier rounds
+    (simultaneous openings), unlike the sequential pro → con flow where
+    con also sees the pro argument of the current round.
+    """
+
+    def __init__(self, pro: DebaterAgent, con: DebaterAgent):
+        super().__init__("Debater_ROUND")
+        self.pro = pro
+        self.con = con
+
+    def process(self, context: DebateContext) -> DebateContext:
+        """Generate both arguments for the current round and update context."""
+        self._log(context, "starting_generation", {
+            "stance": "both",
+            "round": context.current_round,
+        })
+
+        domain = context.domain or "education"
+        passages = context.retrieved_passages
+
+        # The pro debater owns the shared model; con only contributes its prompt
+        self.pro._ensure_model_loaded()
+        self.pro._load_adapter(domain)
+
+        prompts = [
+            self.pro.build_prompt(
+                context.topic, domain, passages,
+                [t.argument for t in context.con_turns],
+            ),
+            self.con.build_prompt(
+                context.topic, domain, passages,
+                [t.argument for t in context.pro_turns],
+            ),
+        ]
+        pro_argument, con_argument = self.pro.generate_batch(prompts)
+
+        pro_turn = self.pro.make_turn(pro_argument, passages)
+        con_turn = self.con.make_turn(con_argument, passages)
+        context.pro_turns.append(pro_turn)
+        context.con_turns.append(con_turn)
+
+        context.current_round += 1
+        if context.current_round >= context.num_rounds:
+            context.current_state = AgentState.FACT_CHECKING
+        else:
+            context.current_state = AgentState.DEBATING_PRO
+
+        self._log(context, "generation_complete", {
+            "argument_length": len(pro_turn.argument) + len(con_turn.argument),
+            "sources_used": len(pro_turn.sources),
+        })
+
+        return context
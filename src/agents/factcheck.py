@@ -3,15 +3,36 @@ Fact Check Agent - Verifies claims against retrieved context.
 """
 
 import re
+
 from src.agents.base import Agent, AgentState, DebateContext
 
+_SENT_RE = re.compile(r'[.!?]+')
+# Content words only: 4+ characters (the TF-IDF token pattern)
+_TOKEN_PATTERN = r"(?u)\b\w{4,}\b"
+
+STOPWORDS = frozenset({
+    'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be',
+    'been', 'being', 'have', 'has', 'had', 'do', 'does',
+    'did', 'will', 'would', 'could', 'should', 'may',
+    'might', 'must', 'shall', 'can', 'need', 'dare',
+    'ought', 'used', 'to', 'of', 'in', 'for', 'on', 'with',
+    'at', 'by', 'from', 'as', 'into', 'through', 'during',
+    'before', 'after', 'above', 'below', 'between', 'under',
+    'again', 'further', 'then', 'once', 'here', 'there',
+    'when', 'where', 'why', 'how', 'all', 'each', 'few',
+    'more', 'most', 'other', 'some', 'such', 'no', 'nor',
+    'not', 'only', 'own', 'same', 'so', 'than', 'too',
+    'very', 'just', 'and', 'but', 'if', 'or', 'because',
+    'until', 'while', 'that', 'this', 'these', 'those',
+})
+
 
 class FactCheckAgent(Agent):
     """
     Checks debate arguments against retrieved passages.
 
     Uses simple heuristics to score claim support:
-    - Keyword overlap between claims and sources
+    - TF-IDF cosine similarity between claims and passages
     - Source citation presence
     - Consistency checks
     """
@@ -21,56 +42,68 @@ class FactCheckAgent(Agent):
 
     def _extract_claims(self, argument: str) -> list[str]:
         """Extract key claims from an argument."""
-        # Split into sentences
-        sentences = re.split(r'[.!?]+', argument)
-        claims = []
-
-        for sent in sentences:
-            sent = sent.strip()
-            # Filter for substantive claims (longer sentences)
-            if len(sent.split()) >= 5:
-                claims.append(sent)
-
-        return claims
-
-    def _compute_keyword_overlap(self, text1: str, text2: str) -> float:
-        """Compute keyword overlap between two texts."""
-        def get_keywords(text):
-            text = text.lower()
-            text = re.sub(r'[^\w\s]', '', text)
-            words = text.split()
-            # Filter stopwords
-            stopwords = {'the', 'a', 'an', 'is', 'are', 'was', 'were', 'be',
-                        'been', 'being', 'have', 'has', 'had', 'do', 'does',
-                        'did', 'will', 'would', 'could', 'should', 'may',
-                        'might', 'must', 'shall', 'can', 'need', 'dare',
-                        'ought', 'used', 'to', 'of', 'in', 'for', 'on', 'with',
-                        'at', 'by', 'from', 'as', 'into', 'through', 'during',
-                        'before', 'after', 'above', 'below', 'between', 'under',
-                        'again', 'further', 'then', 'once', 'here', 'there',
-                        'when', 'where', 'why', 'how', 'all', 'each', 'few',
-                        'more', 'most', 'other', 'some', 'such', 'no', 'nor',
-                        'not', 'only', 'own', 'same', 'so', 'than', 'too',
-                        'very', 'just', 'and', 'but', 'if', 'or', 'because',
-                        'until', 'while', 'that', 'this', 'these', 'those'}
-            return set(w for w in words if len(w) > 3 and w not in stopwords)
-
-        keywords1 = get_keywords(text1)
-        keywords2 = get_keywords(text2)
-
-        if not keywords1 or not keywords2:
-            return 0.0
-
-        intersection = keywords1 & keywords2
-        union = keywords1 | keywords2
-
-        return len(intersection) / len(union) if union else 0.0
+        # Split into sentences, keeping substantive claims (longer sentences)
+        stripped = (sent.strip() for sent in _SENT_RE.split(argument))
+        return [sent for sent in stripped if len(sent.split()) >= 5]
+
+    def split_complete_claims(self, text: str) -> tuple[list[str], str]:
+        """
+        Split partially generated text at its last sentence terminator.
+
+        Returns:
+            (claims from the finished sentences, unfinished remainder)
+        """
+        end = 0
+        for match in _SENT_RE.finditer(text):
+            end = match.end()
+        if not end:
+            return [], text
+        return self._extract_claims(text[:end]), text[end:]
+
+    def fit_passages(self, passages: list[dict]):
+        """
+        Fit a TF-IDF index over the passages (shared by every turn).
+
+        Only content words (>3 chars, no stopwords) are indexed.
+
+        Returns:
+            (vectorizer, passage_matrix), or None if there is nothing to index
+        """
+        texts = [p["text"] for p in passages]
+        if not texts:
+            return None
+
+        # Imported here so loading the agents package doesn't pull in sklearn
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        vectorizer = TfidfVectorizer(
+            token_pattern=_TOKEN_PATTERN,
+            stop_words=sorted(STOPWORDS),
+        )
+        try:
+            passage_matrix = vectorizer.fit_transform(texts)
+        except ValueError:
+            # Empty vocabulary: passages contain only stopwords/short words
+            return None
+        return vectorizer, passage_matrix
+
+    def score_claims(self, claims: list[str], passage_index) -> list[float]:
+        """Best passage cosine similarity for each claim."""
+        if not claims or passage_index is None:
+            return []
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        vectorizer, passage_matrix = passage_index
+        claim_matrix = vectorizer.transform(claims)
+        return cosine_similarity(claim_matrix, passage_matrix).max(axis=1).tolist()
 
     def check_argument(
         self,
         argument: str,
         sources: list[str],
         passages: list[dict],
+        passage_index=None,
+        claim_scores: list[float] | None = None,
     ) -> dict:
         """
         Check an argument against source passages.
@@ -79,24 +112,24 @@ class FactCheckAgent(Agent):
             argument: The debate argument to check
             sources: Source citations in the argument
             passages: Retrieved passages to check against
+            passage_index: Precomputed fit_passages(passages)
+            claim_scores: Scores already computed for the leading claims
+                (e.g. while the argument was streaming); the rest are scored here
 
         Returns:
             Dict with fact check results
         """
         claims = self._extract_claims(argument)
-        passage_texts = [p["text"] for p in passages]
-        all_passage_text = " ".join(passage_texts)
-
-        # Compute overall support score
-        if claims:
-            claim_scores = []
-            for claim in claims:
-                # Check overlap with all passages
-                overlap = self._compute_keyword_overlap(claim, all_passage_text)
-                claim_scores.append(overlap)
-
+        claim_scores = list(claim_scores or [])
+        if len(claim_scores) < len(claims):
+            if passage_index is None:
+                passage_index = self.fit_passages(passages)
+            claim_scores += self.score_claims(claims[len(claim_scores):], passage_index)
+
+        # Compute overall support score: best-matching passage per claim
+        if claim_scores:
             avg_support = sum(claim_scores) / len(claim_scores)
-            max_support = max(claim_scores) if claim_scores else 0
+            max_support = max(claim_scores)
         else:
             avg_support = 0.0
             max_support = 0.0
@@ -123,23 +156,32 @@ class FactCheckAgent(Agent):
             "num_con_turns": len(context.con_turns),
         })
 
-        # Check all pro turns
-        for turn in context.pro_turns:
-            result = self.check_argument(
-                turn.argument,
-                turn.sources,
-                context.retrieved_passages,
-            )
-            turn.fact_check_result = result
-
-        # Check all con turns
-        for turn in context.con_turns:
-            result = self.check_argument(
+        # Passages are the same for every turn; index them once
+        passage_index = self.fit_passages(context.retrieved_passages)
+
+        # Score the claims of every unchecked turn in one sparse matmul,
+        # then slice the scores back per turn (turns checked while
+        # streaming are kept)
+        turns = [
+            t for t in context.pro_turns + context.con_turns
+            if t.fact_check_result is None
+        ]
+        turn_claims = [self._extract_claims(t.argument) for t in turns]
+        all_scores = self.score_claims(
+            [claim for claims in turn_claims for claim in claims],
+            passage_index,
+        )
+
+        offset = 0
+        for turn, claims in zip(turns, turn_claims):
+            turn.fact_check_result = self.check_argument(
                 turn.argument,
                 turn.sources,
                 context.retrieved_passages,
+                passage_index=passage_index,
+                claim_scores=all_scores[offset:offset + len(claims)],
             )
-            turn.fact_check_result = result
+            offset += len(claims)
 
         # Compute aggregate metrics
         all_turns = context.pro_turns + context.con_turns
@@ -4,6 +4,34 @@ Judge Agent - Evaluates debate and outputs structured scores.
 
 import re
 from src.agents.base import Agent, AgentState, DebateContext, JudgeScore
+from src.utils.keyword_matching import build_automaton
+
+# Logical connectors
+LOGICAL_MARKERS = (
+    'because', 'therefore', 'thus', 'hence', 'consequently',
+    'furthermore', 'moreover', 'however', 'nevertheless',
+    'first', 'second', 'finally', 'in conclusion'
+)
+
+# Evidence indicators
+EVIDENCE_MARKERS = (
+    'study', 'research', 'data', 'statistics', 'survey',
+    'according to', 'evidence', 'shows', 'demonstrates',
+    'percent', '%', 'report', 'analysis'
+)
+
+
+# Single-pass marker scanners (None without pyahocorasick)
+_LOGIC_AC = build_automaton((marker, marker) for marker in LOGICAL_MARKERS)
+_EVIDENCE_AC = build_automaton((marker, marker) for marker in EVIDENCE_MARKERS)
+
+
+def _count_markers(text: str, markers: tuple[str, ...], automaton=None) -> int:
+    """Count marker occurrences in (lowercased) text, repeats included."""
+    if automaton is not None:
+        # Single linear pass over the text for all markers at once
+        return sum(1 for _ in automaton.iter(text))
+    return sum(text.count(m) for m in markers)
 
 
 class JudgeAgent(Agent):
@@ -26,22 +54,22 @@ class JudgeAgent(Agent):
         word_count = len(argument.split())
         length_score = min(word_count / 100, 1.0) * 10
 
+        argument_lower = argument.lower()
+
         # Check for logical connectors
-        logical_markers = [
-            'because', 'therefore', 'thus', 'hence', 'consequently',
-            'furthermore', 'moreover', 'however', 'nevertheless',
-            'first', 'second', 'finally', 'in conclusion'
-        ]
-        logic_count = sum(1 for m in logical_markers if m in argument.lower())
+        logic_count = _count_markers(
+            argument_lower,
+            LOGICAL_MARKERS,
+            _LOGIC_AC,
+        )
         logic_score = min(logic_count / 3, 1.0) * 10
 
         # Check for evidence indicators
-        evidence_markers = [
-            'study', 'research', 'data', 'statistics', 'survey',
-            'according to', 'evidence', 'shows', 'demonstrates',
-            'percent', '%', 'report', 'analysis'
-        ]
-        evidence_count = sum(1 for m in evidence_markers if m in argument.lower())
+        evidence_count = _count_markers(
+            argument_lower,
+            EVIDENCE_MARKERS,
+            _EVIDENCE_AC,
+        )
         evidence_score = min(evidence_count / 2, 1.0) * 10
 
         return {
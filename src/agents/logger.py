@@ -2,27 +2,44 @@
 Logger Agent - Logs metrics and artifacts for evaluation.
 """
 
+import asyncio
+import itertools
 import json
 from pathlib import Path
+from typing import Callable, TextIO
 from datetime import datetime
-from dataclasses import asdict
 
 from src.agents.base import Agent, AgentState, DebateContext
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 class LoggerAgent(Agent):
     """
     Logs all debate metrics and artifacts to disk.
 
     Produces:
-    - Structured JSON metrics
+    - Structured JSON debate data (including metrics and agent logs)
     - Human-readable debate transcript
-    - Agent execution logs
     """
 
     def __init__(self, output_dir: Path | None = None):
         super().__init__("Logger")
         self.output_dir = output_dir or Path("runs/debates")
+        # Created once; each debate only adds its own subdirectory
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._debate_counter = itertools.count()
+
+    def _format_logs(self, context: DebateContext) -> list[dict]:
+        """Agent logs with their epoch-ns timestamps as ISO strings."""
+        return [
+            {**entry, "timestamp": datetime.fromtimestamp(entry["timestamp"] / 1e9).isoformat()}
+            for entry in context.agent_logs
+        ]
 
     def _serialize_context(self, context: DebateContext) -> dict:
         """Serialize debate context to JSON-compatible dict."""
@@ -32,26 +49,8 @@ class LoggerAgent(Agent):
             "num_rounds": context.num_rounds,
             "started_at": context.started_at,
             "completed_at": context.completed_at,
-            "pro_turns": [
-                {
-                    "stance": t.stance,
-                    "argument": t.argument,
-                    "sources": t.sources,
-                    "fact_check": t.fact_check_result,
-                    "timestamp": t.timestamp,
-                }
-                for t in context.pro_turns
-            ],
-            "con_turns": [
-                {
-                    "stance": t.stance,
-                    "argument": t.argument,
-                    "sources": t.sources,
-                    "fact_check": t.fact_check_result,
-                    "timestamp": t.timestamp,
-                }
-                for t in context.con_turns
-            ],
+            "pro_turns": [t.to_dict() for t in context.pro_turns],
+            "con_turns": [t.to_dict() for t in context.con_turns],
             "retrieved_passages": context.retrieved_passages,
             "corpus_stats": context.corpus_stats,
             "judge_score": {
@@ -62,19 +61,22 @@ class LoggerAgent(Agent):
                 "criteria_scores": context.judge_score.criteria_scores,
             } if context.judge_score else None,
             "metrics": context.metrics,
-            "agent_logs": context.agent_logs,
+            "agent_logs": self._format_logs(context),
         }
 
-    def _generate_transcript(self, context: DebateContext) -> str:
-        """Generate human-readable debate transcript."""
-        lines = []
-        lines.append("=" * 60)
-        lines.append("DEBATE TRANSCRIPT")
-        lines.append("=" * 60)
-        lines.append(f"\nTopic: {context.topic}")
-        lines.append(f"Domain: {context.domain}")
-        lines.append(f"Date: {context.started_at}")
-        lines.append("")
+    def _write_transcript(self, context: DebateContext, fp: TextIO):
+        """Write the human-readable debate transcript line by line to fp."""
+        def line(text: str = ""):
+            fp.write(text)
+            fp.write("\n")
+
+        line("=" * 60)
+        line("DEBATE TRANSCRIPT")
+        line("=" * 60)
+        line(f"\nTopic: {context.topic}")
+        line(f"Domain: {context.domain}")
+        line(f"Date: {context.started_at}")
+        line()
 
         # Interleave pro and con turns
         max_turns = max(len(context.pro_turns), len(context.con_turns))
@@ -82,82 +84,99 @@ class LoggerAgent(Agent):
         for i in range(max_turns):
             if i < len(context.pro_turns):
                 turn = context.pro_turns[i]
-                lines.append(f"\n--- Round {i+1}: PRO ---")
-                lines.append(turn.argument)
+                line(f"\n--- Round {i+1}: PRO ---")
+                line(turn.argument)
                 if turn.fact_check_result:
                     fc = turn.fact_check_result
-                    lines.append(f"[Faithfulness: {fc['faithfulness_score']:.2f}]")
+                    line(f"[Faithfulness: {fc['faithfulness_score']:.2f}]")
 
             if i < len(context.con_turns):
                 turn = context.con_turns[i]
-                lines.append(f"\n--- Round {i+1}: CON ---")
-                lines.append(turn.argument)
+                line(f"\n--- Round {i+1}: CON ---")
+                line(turn.argument)
                 if turn.fact_check_result:
                     fc = turn.fact_check_result
-                    lines.append(f"[Faithfulness: {fc['faithfulness_score']:.2f}]")
+                    line(f"[Faithfulness: {fc['faithfulness_score']:.2f}]")
 
         # Add judgment
         if context.judge_score:
-            lines.append("\n" + "=" * 60)
-            lines.append("JUDGMENT")
-            lines.append("=" * 60)
-            lines.append(f"\nPro Score: {context.judge_score.pro_score:.2f}/10")
-            lines.append(f"Con Score: {context.judge_score.con_score:.2f}/10")
-            lines.append(f"Winner: {context.judge_score.winner.upper()}")
-            lines.append(f"\nReasoning: {context.judge_score.reasoning}")
-
-        return "\n".join(lines)
+            line("\n" + "=" * 60)
+            line("JUDGMENT")
+            line("=" * 60)
+            line(f"\nPro Score: {context.judge_score.pro_score:.2f}/10")
+            line(f"Con Score: {context.judge_score.con_score:.2f}/10")
+            line(f"Winner: {context.judge_score.winner.upper()}")
+            line(f"\nReasoning: {context.judge_score.reasoning}")
+
+    def _make_debate_dir(self) -> Path:
+        """Create the output directory for one debate."""
+        # The counter keeps back-to-back debates within a second apart
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        debate_dir = self.output_dir / f"{timestamp}_{next(self._debate_counter):03d}"
+        debate_dir.mkdir(exist_ok=True)
+        return debate_dir
+
+    def _write_json(self, context: DebateContext, json_path: Path):
+        """Write debate_data.json (includes metrics and agent logs)."""
+        payload = self._serialize_context(context)
+        if ORJSON_AVAILABLE:
+            json_path.write_bytes(orjson.dumps(
+                payload,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+            ))
+        else:
+            with open(json_path, 'w', encoding="utf-8") as f:
+                json.dump(payload, f, indent=2)
+
+    def _write_transcript_file(self, context: DebateContext, transcript_path: Path):
+        """Write transcript.txt."""
+        # Fixed UTF-8 without newline translation; the 1 MiB buffer holds a
+        # whole transcript, so it reaches the file in a single write
+        with open(transcript_path, 'w', encoding="utf-8", newline="", buffering=1 << 20) as f:
+            self._write_transcript(context, f)
+
+    def _artifact_writers(self, context: DebateContext) -> dict[str, tuple[Path, Callable]]:
+        """Map artifact names to (path, writer) for a new debate directory."""
+        debate_dir = self._make_debate_dir()
+        return {
+            "json_data": (debate_dir / "debate_data.json", self._write_json),
+            "transcript": (debate_dir / "transcript.txt", self._write_transcript_file),
+        }
 
     def save_artifacts(self, context: DebateContext) -> dict[str, Path]:
         """
         Save all debate artifacts to disk.
 
+        Metrics and agent logs are part of debate_data.json, so the debate
+        is serialized once into a single JSON document plus the transcript.
+
         Returns:
             Dict mapping artifact names to file paths
         """
-        # Create output directory
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        debate_dir = self.output_dir / timestamp
-        debate_dir.mkdir(parents=True, exist_ok=True)
-
         artifacts = {}
-
-        # Save JSON data
-        json_path = debate_dir / "debate_data.json"
-        with open(json_path, 'w') as f:
-            json.dump(self._serialize_context(context), f, indent=2)
-        artifacts["json_data"] = json_path
-
-        # Save transcript
-        transcript_path = debate_dir / "transcript.txt"
-        with open(transcript_path, 'w') as f:
-            f.write(self._generate_transcript(context))
-        artifacts["transcript"] = transcript_path
-
-        # Save metrics summary
-        metrics_path = debate_dir / "metrics.json"
-        with open(metrics_path, 'w') as f:
-            json.dump(context.metrics, f, indent=2)
-        artifacts["metrics"] = metrics_path
-
-        # Save agent logs
-        logs_path = debate_dir / "agent_logs.json"
-        with open(logs_path, 'w') as f:
-            json.dump(context.agent_logs, f, indent=2)
-        artifacts["agent_logs"] = logs_path
-
+        for name, (path, writer) in self._artifact_writers(context).items():
+            writer(context, path)
+            artifacts[name] = path
         return artifacts
 
-    def process(self, context: DebateContext) -> DebateContext:
-        """Log all debate artifacts."""
+    async def save_artifacts_async(self, context: DebateContext) -> dict[str, Path]:
+        """Save all debate artifacts, writing the files concurrently in threads."""
+        writers = self._artifact_writers(context)
+        await asyncio.gather(*(
+            asyncio.to_thread(writer, context, path)
+            for path, writer in writers.values()
+        ))
+        return {name: path for name, (path, _) in writers.items()}
+
+    def _start_logging(self, context: DebateContext):
+        """Log the start of the logging step and stamp completion time."""
         self._log(context, "starting_logging", {})
 
         # Mark completion time
         context.completed_at = datetime.now().isoformat()
 
-        # Save artifacts
-        artifacts = self.save_artifacts(context)
-
+    def _finish_logging(self, context: DebateContext, artifacts: dict[str, Path]) -> DebateContext:
+        """Record artifact paths and complete the debate."""
         # Record artifact paths in metrics
         context.metrics["artifacts"] = {
             name: str(path) for name, path in artifacts.items()
@@ -170,3 +189,24 @@ class LoggerAgent(Agent):
 
         context.current_state = AgentState.COMPLETE
         return context
+
+    async def process_async(self, context: DebateContext) -> DebateContext:
+        """Log all debate artifacts without blocking the event loop."""
+        self._start_logging(context)
+        artifacts = await self.save_artifacts_async(context)
+        return self._finish_logging(context, artifacts)
+
+    def process(self, context: DebateContext) -> DebateContext:
+        """Log all debate artifacts."""
+        self._start_logging(context)
+
+        # Save artifacts concurrently, unless we're already inside an event
+        # loop (async callers should use process_async)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            artifacts = asyncio.run(self.save_artifacts_async(context))
+        else:
+            artifacts = self.save_artifacts(context)
+
+        return self._finish_logging(context, artifacts)
@@ -4,12 +4,35 @@ Research Agent - Retrieves relevant information via web search.
 Uses DuckDuckGo for real-time web research on any debate topic.
 """
 
+import json
 import re
-from dataclasses import dataclass
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import closing
+from dataclasses import asdict, dataclass
+from itertools import islice
 from pathlib import Path
+
+from cachetools import LRUCache
+
 from src.agents.base import Agent, AgentState, DebateContext
 from src.utils.web_search import WebSearcher, ResearchData, quick_research
 
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+RESEARCH_CACHE_PATH = PROJECT_ROOT / "data" / "cache" / "research_cache.sqlite"
+RESEARCH_CACHE_TTL = 7 * 24 * 60 * 60  # seconds before persisted research is refetched
+
+
+def _has_content(research: ResearchData) -> bool:
+    """Whether research found any arguments, facts or sources."""
+    return bool(
+        research.pro_arguments
+        or research.con_arguments
+        or research.facts
+        or research.sources
+    )
+
 
 @dataclass
 class Passage:
@@ -28,53 +51,116 @@ class ResearchAgent(Agent):
     Searches the internet for topic arguments, facts, and sources.
     """
 
-    def __init__(self, use_web_search: bool = True):
+    def __init__(
+        self,
+        use_web_search: bool = True,
+        cache_size: int = 128,
+        cache_path: Path | None = RESEARCH_CACHE_PATH,
+        cache_ttl: float = RESEARCH_CACHE_TTL,
+    ):
         """
         Initialize research agent.
         
         Args:
             use_web_search: If True, search the web. If False, use cached data only.
+            cache_size: Number of topics kept in memory (least recently used evicted)
+            cache_path: SQLite file that persists research across restarts
+                (None keeps the cache in memory only)
+            cache_ttl: Seconds before persisted research is considered stale
         """
         super().__init__("Research")
         self.use_web_search = use_web_search
+        self.cache_path = cache_path
+        self.cache_ttl = cache_ttl
         self._searcher = WebSearcher(timeout=15.0, max_results=5)
-        self._cache: dict[str, ResearchData] = {}
+        self._cache: LRUCache[str, ResearchData] = LRUCache(maxsize=cache_size)
+
+    def _connect_cache(self) -> sqlite3.Connection:
+        """Open the persistent research cache, creating it if needed."""
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.cache_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS research "
+            "(topic TEXT PRIMARY KEY, data TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        return conn
+
+    def _load_persisted(self, cache_key: str) -> ResearchData | None:
+        """Look up research for a topic in the persistent cache (None if missing or stale)."""
+        if self.cache_path is None or not self.cache_path.exists():
+            return None
+        try:
+            with closing(self._connect_cache()) as conn:
+                row = conn.execute(
+                    "SELECT data, fetched_at FROM research WHERE topic = ?", (cache_key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"[Research] Cache read failed: {e}")
+            return None
+        if row is None or time.time() - row[1] > self.cache_ttl:
+            return None
+        research = ResearchData(**json.loads(row[0]))
+        # Empty entries written before failed searches were skipped
+        return research if _has_content(research) else None
+
+    def _persist(self, cache_key: str, research: ResearchData):
+        """Store research for a topic in the persistent cache."""
+        if self.cache_path is None:
+            return
+        try:
+            with closing(self._connect_cache()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO research (topic, data, fetched_at) VALUES (?, ?, ?)",
+                    (cache_key, json.dumps(asdict(research)), time.time()),
+                )
+        except sqlite3.Error as e:
+            print(f"[Research] Cache write failed: {e}")
+
+    def _iter_passages(self, research: ResearchData) -> Iterator[Passage]:
+        """Yield Passages from ResearchData in ranking order."""
+        sources = research.sources
+        num_sources = len(sources)
+        num_pro = len(research.pro_arguments)
 
-    def _research_to_passages(self, research: ResearchData) -> list[Passage]:
-        """Convert ResearchData to list of Passages."""
-        passages = []
-        
         # Pro arguments
         for i, arg in enumerate(research.pro_arguments):
-            passages.append(Passage(
+            yield Passage(
                 text=arg,
-                source=research.sources[i] if i < len(research.sources) else "web_search",
+                source=sources[i] if i < num_sources else "web_search",
                 score=1.0 - (i * 0.1),
                 domain="general",
                 stance="pro",
-            ))
-        
+            )
+
         # Con arguments
         for i, arg in enumerate(research.con_arguments):
-            passages.append(Passage(
+            yield Passage(
                 text=arg,
-                source=research.sources[len(research.pro_arguments) + i] if (len(research.pro_arguments) + i) < len(research.sources) else "web_search",
+                source=sources[num_pro + i] if num_pro + i < num_sources else "web_search",
                 score=1.0 - (i * 0.1),
                 domain="general",
                 stance="con",
-            ))
-        
+            )
+
         # Facts (neutral)
+        fact_source = sources[-1] if sources else "web_search"
         for i, fact in enumerate(research.facts):
-            passages.append(Passage(
+            yield Passage(
                 text=fact,
-                source=research.sources[-1] if research.sources else "web_search",
+                source=fact_source,
                 score=0.9 - (i * 0.1),
                 domain="general",
                 stance="neutral",
-            ))
-        
-        return passages
+            )
+
+    def _research_to_passages(
+        self,
+        research: ResearchData,
+        limit: int | None = None,
+    ) -> list[Passage]:
+        """Convert ResearchData to list of Passages (at most limit)."""
+        # Passages past the limit are never constructed
+        return list(islice(self._iter_passages(research), limit))
 
     def retrieve(
         self,
@@ -91,25 +177,32 @@ class ResearchAgent(Agent):
         Returns:
             List of Passage objects
         """
-        # Check cache first
+        # Check cache first (memory, then disk)
         cache_key = topic.lower().strip()
-        if cache_key in self._cache:
-            research = self._cache[cache_key]
-        elif self.use_web_search:
+        research = self._cache.get(cache_key)
+        if research is None:
+            research = self._load_persisted(cache_key)
+            if research is not None:
+                self._cache[cache_key] = research
+
+        if research is None:
+            if not self.use_web_search:
+                return []
             # Perform live web search
             print(f"[Research] Searching web for: {topic}")
             try:
                 research = quick_research(topic)
-                self._cache[cache_key] = research
             except Exception as e:
                 print(f"[Research] Web search failed: {e}")
                 # Return empty if search fails
                 return []
-        else:
-            return []
-        
-        passages = self._research_to_passages(research)
-        return passages[:top_k]
+            # Failed searches come back empty; don't let them stick to the topic
+            if not _has_content(research):
+                return []
+            self._cache[cache_key] = research
+            self._persist(cache_key, research)
+
+        return self._research_to_passages(research, limit=top_k)
 
     def process(self, context: DebateContext) -> DebateContext:
         """Retrieve relevant information for the debate topic."""
@@ -124,28 +217,29 @@ class ResearchAgent(Agent):
             top_k=10,
         )
 
-        context.retrieved_passages = [
-            {
+        # Serialize passages and tally stances/sources in a single pass
+        retrieved = []
+        stance_counts = {"pro": 0, "con": 0, "neutral": 0}
+        sources = set()
+        for p in passages:
+            retrieved.append({
                 "text": p.text,
                 "source": p.source,
                 "score": p.score,
                 "domain": p.domain,
                 "stance": p.stance,
-            }
-            for p in passages
-        ]
-
-        # Separate pro and con passages for the debater
-        pro_passages = [p for p in passages if p.stance == "pro"]
-        con_passages = [p for p in passages if p.stance == "con"]
-        neutral_passages = [p for p in passages if p.stance == "neutral"]
+            })
+            if p.stance in stance_counts:
+                stance_counts[p.stance] += 1
+            sources.add(p.source)
+        context.retrieved_passages = retrieved
 
         context.corpus_stats = {
             "num_retrieved": len(passages),
-            "num_pro": len(pro_passages),
-            "num_con": len(con_passages),
-            "num_facts": len(neutral_passages),
-            "sources": list(set(p.source for p in passages)),
+            "num_pro": stance_counts["pro"],
+            "num_con": stance_counts["con"],
+            "num_facts": stance_counts["neutral"],
+            "sources": list(sources),
             "web_search_used": self.use_web_search,
         }
 
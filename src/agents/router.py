@@ -4,6 +4,7 @@ Domain Router Agent - Routes topics to appropriate domain adapters.
 
 import re
 from src.agents.base import Agent, AgentState, DebateContext
+from src.utils.keyword_matching import build_automaton
 
 
 # Domain keywords for classification
@@ -48,6 +49,33 @@ class DomainRouterAgent(Agent):
         self.domain_keywords = DOMAIN_KEYWORDS
         self.available_domains = list(DOMAIN_KEYWORDS.keys())
 
+        # Lowercase once; longer keywords get higher weight
+        self._keyword_table: dict[str, list[tuple[str, int]]] = {}
+        for domain, keywords in self.domain_keywords.items():
+            for keyword in keywords:
+                self._keyword_table.setdefault(keyword.lower(), []).append(
+                    (domain, len(keyword.split()))
+                )
+
+        self._automaton = build_automaton(
+            (keyword, (keyword, hits)) for keyword, hits in self._keyword_table.items()
+        )
+
+    def _matched_keywords(self, topic_lower: str):
+        """Yield (keyword, [(domain, weight), ...]) for each keyword in the topic."""
+        if self._automaton is not None:
+            # One pass over the topic for all keywords; report each once
+            seen = set()
+            for _, (keyword, hits) in self._automaton.iter(topic_lower):
+                if keyword not in seen:
+                    seen.add(keyword)
+                    yield keyword, hits
+            return
+
+        for keyword, hits in self._keyword_table.items():
+            if keyword in topic_lower:
+                yield keyword, hits
+
     def _classify_topic(self, topic: str) -> tuple[str, float]:
         """
         Classify a topic into a domain.
@@ -59,24 +87,20 @@ class DomainRouterAgent(Agent):
             Tuple of (domain, confidence_score)
         """
         topic_lower = topic.lower()
-        scores = {}
+        scores = dict.fromkeys(self.domain_keywords, 0)
 
-        for domain, keywords in self.domain_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword.lower() in topic_lower:
-                    # Longer keywords get higher weight
-                    score += len(keyword.split())
-            scores[domain] = score
-
-        # Find best match
-        best_domain = max(scores, key=scores.get)
-        total_score = sum(scores.values())
-
-        if total_score > 0:
-            confidence = scores[best_domain] / total_score
-        else:
-            confidence = 0.0
+        for _, hits in self._matched_keywords(topic_lower):
+            for domain, weight in hits:
+                scores[domain] += weight
+
+        # Find best match and total in one pass (first domain wins ties)
+        best_domain, best_score, total_score = None, -1, 0
+        for domain, score in scores.items():
+            total_score += score
+            if score > best_score:
+                best_domain, best_score = domain, score
+
+        confidence = best_score / total_score if total_score > 0 else 0.0
 
         return best_domain, confidence
 
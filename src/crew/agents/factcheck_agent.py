@@ -5,8 +5,34 @@ Evaluates debate arguments for factual accuracy and
 faithfulness to the research context.
 """
 
+import re
+from itertools import chain
+from typing import Iterator
+
 from crewai import Agent
 
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_WORD_RE = re.compile(r'\b\w+\b')
+
+# Maps every ASCII non-word character to a space, so str.split() yields
+# the same tokens as _WORD_RE on ASCII text
+_ASCII_NON_WORD = str.maketrans({
+    c: ' ' for c in map(chr, range(128)) if not (c.isalnum() or c == '_')
+})
+
+_DEFAULT_STOPWORDS = frozenset({
+    "the", "a", "an", "is", "are", "was", "were", "be", "been",
+    "being", "have", "has", "had", "do", "does", "did", "will",
+    "would", "could", "should", "may", "might", "can", "to", "of",
+    "in", "for", "on", "with", "at", "by", "from", "as", "into",
+    "through", "during", "before", "after", "above", "below",
+    "between", "under", "again", "further", "then", "once", "and",
+    "but", "if", "or", "because", "until", "while", "although",
+    "this", "that", "these", "those", "it", "its", "they", "them",
+    "their", "we", "our", "you", "your", "i", "my", "me", "he",
+    "she", "his", "her", "who", "which", "what", "when", "where",
+})
+
 
 def create_factcheck_agent() -> Agent:
     """
@@ -34,10 +60,42 @@ def create_factcheck_agent() -> Agent:
     )
 
 
+def _iter_claims(text: str, min_words: int = 5) -> Iterator[str]:
+    """Yield the sentences of text that have at least min_words words."""
+    # A sentence of n words is at least 2n - 1 characters long, so shorter
+    # spans are skipped without slicing them out
+    min_chars = 2 * min_words - 1
+    start = 0
+    for match in chain(_SENT_SPLIT.finditer(text), (None,)):
+        end = match.start() if match else len(text)
+        if end - start >= min_chars:
+            sentence = text[start:end]
+            # Only split as far as needed to know the sentence is long enough
+            if len(sentence.split(None, min_words - 1)) >= min_words:
+                yield sentence
+        if match:
+            start = match.end()
+
+
+def _words(text: str) -> list[str]:
+    """Split text into word tokens, skipping the regex engine for ASCII text."""
+    if text.isascii():
+        return text.translate(_ASCII_NON_WORD).split()
+    return _WORD_RE.findall(text)
+
+
+def _content_words(text: str, stopwords) -> frozenset:
+    """Lowercased words of text, minus stopwords and words of 1-2 letters."""
+    return frozenset(
+        word for word in map(str.lower, _words(text))
+        if len(word) > 2 and word not in stopwords
+    )
+
+
 def compute_faithfulness_score(
     argument: str,
     research_context: str,
-    stopwords: set = None,
+    stopwords: frozenset = None,
 ) -> dict:
     """
     Compute how well an argument is supported by research.
@@ -52,26 +110,42 @@ def compute_faithfulness_score(
     Returns:
         Dict with faithfulness metrics
     """
+    return compute_faithfulness_batch([argument], research_context, stopwords)[0]
+
+
+def compute_faithfulness_batch(
+    arguments: list[str],
+    research_context: str,
+    stopwords: frozenset = None,
+) -> list[dict]:
+    """
+    Compute faithfulness for several arguments against the same research.
+    
+    The research context is tokenized once and shared by every argument.
+    
+    Args:
+        arguments: The debate arguments to check
+        research_context: Available research/evidence
+        stopwords: Words to exclude from comparison
+        
+    Returns:
+        List of faithfulness metric dicts, one per argument
+    """
     if stopwords is None:
-        stopwords = {
-            "the", "a", "an", "is", "are", "was", "were", "be", "been",
-            "being", "have", "has", "had", "do", "does", "did", "will",
-            "would", "could", "should", "may", "might", "can", "to", "of",
-            "in", "for", "on", "with", "at", "by", "from", "as", "into",
-            "through", "during", "before", "after", "above", "below",
-            "between", "under", "again", "further", "then", "once", "and",
-            "but", "if", "or", "because", "until", "while", "although",
-            "this", "that", "these", "those", "it", "its", "they", "them",
-            "their", "we", "our", "you", "your", "i", "my", "me", "he",
-            "she", "his", "her", "who", "which", "what", "when", "where",
-        }
+        stopwords = _DEFAULT_STOPWORDS
     
+    # Tokenize research context
+    research_words = _content_words(research_context, stopwords) if research_context else None
+    
+    return [_score_argument(a, research_words, stopwords) for a in arguments]
+
+
+def _score_argument(argument: str, research_words, stopwords) -> dict:
+    """Score one argument's claims against pre-tokenized research words."""
     # Extract claims (sentences with substance)
-    import re
-    sentences = re.split(r'(?<=[.!?])\s+', argument.strip())
-    claims = [s for s in sentences if len(s.split()) >= 5]
+    claims = list(_iter_claims(argument.strip()))
     
-    if not claims or not research_context:
+    if not claims or research_words is None:
         return {
             "num_claims": len(claims),
             "avg_support_score": 0.0,
@@ -80,31 +154,22 @@ def compute_faithfulness_score(
             "verdict": "insufficient_data",
         }
     
-    # Tokenize research context
-    research_words = set(
-        word.lower() for word in re.findall(r'\b\w+\b', research_context)
-        if word.lower() not in stopwords and len(word) > 2
-    )
-    
-    # Score each claim
-    claim_scores = []
+    # Score each claim, accumulating the total and supported count
+    score_sum = 0.0
+    supported = 0
     for claim in claims:
-        claim_words = set(
-            word.lower() for word in re.findall(r'\b\w+\b', claim)
-            if word.lower() not in stopwords and len(word) > 2
-        )
+        claim_words = _content_words(claim, stopwords)
         
         if not claim_words:
-            claim_scores.append(0.0)
             continue
         
         # Jaccard-like overlap
         overlap = len(claim_words & research_words)
         score = overlap / len(claim_words)
-        claim_scores.append(score)
+        score_sum += score
+        supported += score >= 0.3
     
-    avg_score = sum(claim_scores) / len(claim_scores) if claim_scores else 0.0
-    supported = sum(1 for s in claim_scores if s >= 0.3)
+    avg_score = score_sum / len(claims)
     
     # Determine verdict
     if avg_score >= 0.5:
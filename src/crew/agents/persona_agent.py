@@ -5,14 +5,82 @@ Uses Wikipedia and internet search to find notable people who could
 participate in a real-world version of the debate.
 """
 
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache, partial
+from itertools import islice
+from typing import Iterator
 from crewai import Agent
 
 from src.crew.tools.internet_research import InternetResearchTool
 from src.crew.tools.wikipedia_tool import WikipediaSearchTool
+from src.utils.keyword_matching import build_automaton
 
 
-@dataclass
+# Two capitalized words, a rough person-name heuristic
+_NAME_RE = re.compile(r'[A-Z][a-z]+ [A-Z][a-z]+')
+
+# Domain-specific expert types ("debate" is the fallback)
+EXPERT_TYPES_BY_DOMAIN = {
+    "economics": ("economist", "professor of economics", "financial analyst"),
+    "medicine": ("doctor", "medical researcher", "professor of medicine"),
+    "education": ("education researcher", "professor of education", "teacher"),
+    "ecology": ("environmental scientist", "climate researcher", "ecologist"),
+    "politics": ("political scientist", "policy analyst", "politician"),
+    "technology": ("tech researcher", "computer scientist", "AI researcher"),
+    "debate": ("analyst", "professor", "researcher", "commentator"),
+}
+
+# Strong indicators a bio describes a person
+PERSON_INDICATORS = (
+    "born", "was born", "is a ", "is an ",
+    "professor", "economist", "scientist", "researcher",
+    "journalist", "author", "politician", "activist",
+    "he was", "she was", "he is", "she is",
+    "his career", "her career", "graduated",
+)
+
+# Strong indicators it's NOT a person (it's an event, concept, or article)
+NOT_PERSON_INDICATORS = (
+    "is the name of", "refers to", "was an event",
+    "is a policy", "is a term", "was a period",
+    "presidency of", "administration of", "government of",
+    "is a company", "is an organization",
+)
+
+# Stance indicators
+PRO_STANCE_WORDS = ("advocate", "supporter", "proponent", "promotes", "champion")
+CON_STANCE_WORDS = ("critic", "opponent", "skeptic", "against", "opposes")
+
+# Common credential patterns
+CREDENTIAL_PATTERNS = (
+    "professor", "doctor", "phd", "researcher", "scientist",
+    "journalist", "author", "founder", "director", "ceo",
+    "economist", "lawyer", "physician", "expert",
+)
+
+
+# Every bio pattern, deduplicated, so one scan serves all the checks
+BIO_PATTERNS = tuple(dict.fromkeys(
+    PERSON_INDICATORS
+    + NOT_PERSON_INDICATORS
+    + PRO_STANCE_WORDS
+    + CON_STANCE_WORDS
+    + CREDENTIAL_PATTERNS
+))
+
+_BIO_AC = build_automaton((pattern, pattern) for pattern in BIO_PATTERNS)
+
+
+def _find_patterns(text: str, patterns: tuple[str, ...], automaton=None) -> set[str]:
+    """Return the distinct patterns that occur in text."""
+    if automaton is not None:
+        return {pattern for _, pattern in automaton.iter(text)}
+    return {pattern for pattern in patterns if pattern in text}
+
+
+@dataclass(slots=True)
 class DebateGuest:
     """Recommended debate panel guest."""
     name: str
@@ -22,6 +90,14 @@ class DebateGuest:
     source_url: str
 
 
+@dataclass(slots=True)
+class BioAnalysis:
+    """Person check, credentials and stance derived from one bio scan."""
+    is_person: bool
+    credentials: str
+    stance: str  # "pro", "con", or "unknown"
+
+
 def create_persona_agent(
     internet_tool: InternetResearchTool = None,
     wikipedia_tool: WikipediaSearchTool = None,
@@ -99,38 +175,12 @@ def recommend_debate_guests(
     topic_words = [w for w in topic.lower().split() if len(w) > 3]
     main_subject = " ".join(topic_words[:2]) if topic_words else topic
     
-    # Domain-specific expert types
-    expert_types = {
-        "economics": ["economist", "professor of economics", "financial analyst"],
-        "medicine": ["doctor", "medical researcher", "professor of medicine"],
-        "education": ["education researcher", "professor of education", "teacher"],
-        "ecology": ["environmental scientist", "climate researcher", "ecologist"],
-        "politics": ["political scientist", "policy analyst", "politician"],
-        "technology": ["tech researcher", "computer scientist", "AI researcher"],
-        "debate": ["analyst", "professor", "researcher", "commentator"],
-    }
-    
-    expert_roles = expert_types.get(domain.lower(), expert_types["debate"])
+    expert_roles = EXPERT_TYPES_BY_DOMAIN.get(
+        domain.lower(), EXPERT_TYPES_BY_DOMAIN["debate"]
+    )
     
     # Strategy 1: Search for specific expert types related to topic
-    for role in expert_roles[:2]:
-        search_query = f"{main_subject} {role}"
-        try:
-            wiki_people = wikipedia_tool.search_experts_for_debate(search_query)
-            for person in wiki_people:
-                if person.name not in seen_names and _is_real_person(person.bio):
-                    seen_names.add(person.name)
-                    guests.append(DebateGuest(
-                        name=person.name,
-                        credentials=_extract_credentials(person.bio),
-                        known_stance=_infer_stance(person.bio, topic),
-                        bio=person.bio,
-                        source_url=person.url,
-                    ))
-                    if len(guests) >= num_guests:
-                        return guests
-        except Exception as e:
-            print(f"  ⚠ Expert search failed for {role}: {e}")
+    role_queries = [f"{main_subject} {role}" for role in expert_roles[:2]]
     
     # Strategy 2: Search for people directly named in topic context
     name_queries = [
@@ -139,92 +189,155 @@ def recommend_debate_guests(
         f"famous {main_subject} researcher professor",
     ]
     
-    for query in name_queries:
-        if len(guests) >= num_guests:
-            break
-        try:
-            wiki_people = wikipedia_tool.search_experts_for_debate(query)
-            for person in wiki_people:
-                if person.name not in seen_names and _is_real_person(person.bio):
-                    seen_names.add(person.name)
-                    guests.append(DebateGuest(
-                        name=person.name,
-                        credentials=_extract_credentials(person.bio),
-                        known_stance=_infer_stance(person.bio, topic),
-                        bio=person.bio,
-                        source_url=person.url,
-                    ))
-                    if len(guests) >= num_guests:
-                        break
-        except Exception:
+    # The searches are independent network calls, so issue them together
+    # and walk the results in strategy order
+    queries = role_queries + name_queries
+    unique_queries = {}
+    for query in queries:
+        unique_queries.setdefault(query.lower().strip(), query)
+    with ThreadPoolExecutor(max_workers=len(unique_queries)) as executor:
+        results = dict(zip(
+            unique_queries,
+            executor.map(partial(_search_experts, wikipedia_tool), unique_queries.values()),
+        ))
+    
+    for i, query in enumerate(queries):
+        # A repeated query returns people that were already considered
+        wiki_people, error = results.pop(query.lower().strip(), ([], None))
+        if error is not None:
+            if i < len(role_queries):
+                print(f"  ⚠ Expert search failed for {expert_roles[i]}: {error}")
             continue
+        for person in wiki_people:
+            if person.name in seen_names:
+                continue
+            analysis = _analyze_bio(person.bio)
+            if not analysis.is_person:
+                continue
+            seen_names.add(person.name)
+            guests.append(DebateGuest(
+                name=person.name,
+                credentials=analysis.credentials,
+                known_stance=analysis.stance,
+                bio=person.bio,
+                source_url=person.url,
+            ))
+            if len(guests) >= num_guests:
+                return guests
     
     # Strategy 3: Supplement with internet search for recent experts
     if len(guests) < num_guests and internet_tool and internet_tool.use_internet:
         try:
             expert_results = internet_tool._run(topic, search_type="experts")
-            # Parse looking for names (simple heuristic: capitalized words)
-            import re
-            potential_names = re.findall(r'([A-Z][a-z]+ [A-Z][a-z]+)', expert_results)
-            for name in potential_names[:3]:
-                if name not in seen_names and len(name) > 5:
-                    try:
-                        wiki_check = wikipedia_tool._run(name, search_type="summary", sentences=2)
-                        if "born" in wiki_check.lower() or "is a" in wiki_check.lower():
-                            seen_names.add(name)
-                            guests.append(DebateGuest(
-                                name=name,
-                                credentials=_extract_credentials(wiki_check),
-                                known_stance="unknown",
-                                bio=wiki_check[:200],
-                                source_url=f"https://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
-                            ))
-                            if len(guests) >= num_guests:
-                                break
-                    except Exception:
-                        continue
+            # Check the first few new names (simple heuristic: capitalized words)
+            for name in islice(_candidate_names(expert_results, seen_names), 3):
+                try:
+                    wiki_check = wikipedia_tool._run(name, search_type="summary", sentences=2)
+                    wiki_lower = wiki_check.lower()
+                    if "born" in wiki_lower or "is a" in wiki_lower:
+                        seen_names.add(name)
+                        guests.append(DebateGuest(
+                            name=name,
+                            credentials=_extract_credentials(wiki_check),
+                            known_stance="unknown",
+                            bio=wiki_check[:200],
+                            source_url=f"https://en.wikipedia.org/wiki/{name.replace(' ', '_')}",
+                        ))
+                        if len(guests) >= num_guests:
+                            break
+                except Exception:
+                    continue
         except Exception:
             pass
     
     return guests[:num_guests]
 
 
-def _is_real_person(bio: str) -> bool:
+def _candidate_names(text: str, seen_names: set[str]) -> Iterator[str]:
+    """Lazily yield distinct, not yet seen two-word capitalized names."""
+    tried = set()
+    for match in _NAME_RE.finditer(text):
+        name = match.group(0)
+        if name in seen_names or name in tried or len(name) <= 5:
+            continue
+        tried.add(name)
+        yield name
+
+
+def _search_experts(wikipedia_tool: WikipediaSearchTool, query: str):
+    """Run one expert search, returning (people, error) instead of raising."""
+    try:
+        return wikipedia_tool.search_experts_for_debate(query), None
+    except Exception as e:
+        return [], e
+
+
+# Bios this short never describe a person; they skip the scan entirely
+_MIN_PERSON_BIO_LEN = 50
+
+
+def _bio_patterns(bio: str) -> set[str]:
+    """Return the distinct bio patterns in a bio (one scan)."""
+    return _find_patterns(bio.lower(), BIO_PATTERNS, _BIO_AC)
+
+
+def _credentials_from(matched: set[str]) -> str:
+    """Format up to three matched credentials, in pattern order for stability."""
+    found = [p for p in CREDENTIAL_PATTERNS if p in matched]
+    return ", ".join(found[:3]).title() if found else "Expert"
+
+
+def _stance_from(matched: set[str]) -> str:
+    """Compare matched pro and con stance words."""
+    pro_count = sum(1 for w in PRO_STANCE_WORDS if w in matched)
+    con_count = sum(1 for w in CON_STANCE_WORDS if w in matched)
+    if pro_count > con_count:
+        return "pro"
+    elif con_count > pro_count:
+        return "con"
+    return "unknown"
+
+
+@lru_cache(maxsize=1024)
+def _analyze_bio(bio: str) -> BioAnalysis:
     """
-    Check if a bio describes a real person (not an event, concept, or organization).
+    Analyze a bio with a single scan for every indicator pattern.
     
-    Looks for birth indicators, occupations, and personal pronouns.
-    """
-    if not bio or len(bio) < 50:
-        return False
+    Cached, since the same person often surfaces under several queries.
+    Short bios are rejected before any lowercasing or scanning.
     
-    bio_lower = bio.lower()
+    Args:
+        bio: Biography text
+        
+    Returns:
+        BioAnalysis with the person check, credentials and stance
+    """
+    if not bio or len(bio) < _MIN_PERSON_BIO_LEN:
+        return BioAnalysis(is_person=False, credentials="Expert", stance="unknown")
     
-    # Strong indicators it's a person
-    person_indicators = [
-        "born", "was born", "is a ", "is an ",
-        "professor", "economist", "scientist", "researcher",
-        "journalist", "author", "politician", "activist",
-        "he was", "she was", "he is", "she is",
-        "his career", "her career", "graduated",
-    ]
+    matched = _bio_patterns(bio)
     
-    # Strong indicators it's NOT a person (it's an event, concept, or article)
-    not_person_indicators = [
-        "is the name of", "refers to", "was an event",
-        "is a policy", "is a term", "was a period",
-        "presidency of", "administration of", "government of",
-        "is a company", "is an organization",
-    ]
+    # A person needs no disqualifiers and 2+ indicators
+    person_score = sum(1 for p in PERSON_INDICATORS if p in matched)
+    is_person = (
+        not any(p in matched for p in NOT_PERSON_INDICATORS)
+        and person_score >= 2
+    )
     
-    # Check for disqualifying patterns first
-    for indicator in not_person_indicators:
-        if indicator in bio_lower:
-            return False
+    return BioAnalysis(
+        is_person=is_person,
+        credentials=_credentials_from(matched),
+        stance=_stance_from(matched),
+    )
+
+
+def _is_real_person(bio: str) -> bool:
+    """
+    Check if a bio describes a real person (not an event, concept, or organization).
     
-    # Check for person indicators
-    person_score = sum(1 for ind in person_indicators if ind in bio_lower)
-    return person_score >= 2
+    Looks for birth indicators, occupations, and personal pronouns.
+    """
+    return _analyze_bio(bio).is_person
 
 
 def _infer_stance(bio: str, topic: str) -> str:
@@ -234,38 +347,13 @@ def _infer_stance(bio: str, topic: str) -> str:
     This is a simple heuristic - in practice, you'd want
     more sophisticated analysis.
     """
-    bio_lower = bio.lower()
-    topic_lower = topic.lower()
-    
-    # Pro indicators
-    pro_words = ["advocate", "supporter", "proponent", "promotes", "champion"]
-    # Con indicators  
-    con_words = ["critic", "opponent", "skeptic", "against", "opposes"]
-    
-    pro_count = sum(1 for w in pro_words if w in bio_lower)
-    con_count = sum(1 for w in con_words if w in bio_lower)
-    
-    if pro_count > con_count:
-        return "pro"
-    elif con_count > pro_count:
-        return "con"
-    else:
-        return "unknown"
+    if len(bio) >= _MIN_PERSON_BIO_LEN:
+        return _analyze_bio(bio).stance
+    return _stance_from(_bio_patterns(bio))
 
 
 def _extract_credentials(bio: str) -> str:
     """Extract key credentials from a biography."""
-    # Look for common credential patterns
-    credential_patterns = [
-        "professor", "doctor", "phd", "researcher", "scientist",
-        "journalist", "author", "founder", "director", "ceo",
-        "economist", "lawyer", "physician", "expert",
-    ]
-    
-    bio_lower = bio.lower()
-    found = [p for p in credential_patterns if p in bio_lower]
-    
-    if found:
-        return ", ".join(found[:3]).title()
-    else:
-        return "Expert"
+    if len(bio) >= _MIN_PERSON_BIO_LEN:
+        return _analyze_bio(bio).credentials
+    return _credentials_from(_bio_patterns(bio))
@@ -9,11 +9,77 @@ Responsibilities:
 """
 
 from dataclasses import dataclass, field
+from itertools import chain
 from typing import Optional
 import re
 
+from src.utils.keyword_matching import build_automaton
+from src.utils.markdown import strip_markdown
 
-@dataclass
+_NUMBERED_SPLIT = re.compile(r'\d+\.\s+')
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_STAT_RE = re.compile(r'\d[\d,.]*\s*(?:%|percent|million|billion)', re.ASCII)
+_URL_RE = re.compile(r'https?://[^\s\)]+')
+_SOURCE_RE = re.compile(r'Source:\s*([^\n]+)')
+
+# Pro indicators
+_PRO_WORDS = (
+    "benefit", "advantage", "positive", "improve", "success",
+    "help", "support", "growth", "increase", "better",
+    "opportunity", "solution", "effective", "efficient",
+    "progress", "innovation", "advancement", "gain",
+)
+
+# Con indicators
+_CON_WORDS = (
+    "problem", "risk", "negative", "concern", "issue",
+    "challenge", "threat", "danger", "harm", "cost",
+    "failure", "decline", "decrease", "worse", "obstacle",
+    "criticism", "controversy", "disadvantage", "drawback",
+)
+
+# Neutral/fact indicators
+_FACT_WORDS = (
+    "according to", "research shows", "study found",
+    "data indicates", "statistics show", "report",
+    "survey", "analysis", "evidence", "findings",
+)
+
+
+def _indicator_re(words: tuple[str, ...]) -> re.Pattern:
+    """Compile indicator words into one substring alternation."""
+    return re.compile("|".join(map(re.escape, words)))
+
+
+_PRO_RE = _indicator_re(_PRO_WORDS)
+_CON_RE = _indicator_re(_CON_WORDS)
+_FACT_RE = _indicator_re(_FACT_WORDS)
+
+# One automaton over all indicators, tagged with their category, so a point
+# is scanned once. Overlapping matches are reported, like `in`.
+_INDICATOR_AC = build_automaton(
+    (word, (category, word))
+    for category, words in (("pro", _PRO_WORDS), ("con", _CON_WORDS), ("fact", _FACT_WORDS))
+    for word in words
+)
+
+
+def _indicator_scores(text_lower: str) -> tuple[int, int, int]:
+    """Count the distinct pro, con and fact indicators in a point."""
+    if _INDICATOR_AC is not None:
+        found = {hit for _, hit in _INDICATOR_AC.iter(text_lower)}
+        counts = {"pro": 0, "con": 0, "fact": 0}
+        for category, _ in found:
+            counts[category] += 1
+        return counts["pro"], counts["con"], counts["fact"]
+    return (
+        len(set(_PRO_RE.findall(text_lower))),
+        len(set(_CON_RE.findall(text_lower))),
+        len(set(_FACT_RE.findall(text_lower))),
+    )
+
+
+@dataclass(slots=True)
 class ClassifiedResearch:
     """Structured research data for debaters."""
     topic: str
@@ -25,7 +91,7 @@ class ClassifiedResearch:
     quality_score: int  # 0-100
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchPoint:
     """A single research point with classification."""
     text: str
@@ -59,25 +125,23 @@ def analyze_research(raw_research: str, topic: str) -> ClassifiedResearch:
     # Split into individual points/sentences
     points = _extract_points(raw_research)
     
-    # Classify each point
-    classified = [_classify_point(p, topic) for p in points]
-    
-    # Separate into categories
+    # Classify each point straight into its category. Lists stop growing
+    # at 5, which is all that is kept and where the quality score saturates.
     pro_points = []
     con_points = []
     key_facts = []
     statistics = []
+    by_class = {"pro": pro_points, "con": con_points, "fact": key_facts}
     
-    for point in classified:
-        if point.classification == "pro":
-            pro_points.append(point.text)
-        elif point.classification == "con":
-            con_points.append(point.text)
-        elif point.classification == "fact":
-            key_facts.append(point.text)
+    for text in points:
+        classification, _, has_stat = _classify(text)
+        
+        bucket = by_class.get(classification)
+        if bucket is not None and len(bucket) < 5:
+            bucket.append(text)
         
-        if point.has_statistic:
-            statistics.append(point.text)
+        if has_stat and len(statistics) < 5:
+            statistics.append(text)
     
     # Extract sources
     sources = _extract_sources(raw_research)
@@ -105,23 +169,21 @@ def _extract_points(text: str) -> list[str]:
     points = []
     
     # Handle numbered lists
-    numbered = re.split(r'\d+\.\s+', text)
+    numbered = _NUMBERED_SPLIT.split(text)
     for item in numbered:
         if len(item.strip()) > 30:
             points.append(item.strip())
     
     # If no numbered items, split by sentences
     if len(points) < 3:
-        sentences = re.split(r'(?<=[.!?])\s+', text)
+        sentences = _SENT_SPLIT.split(text)
         points = [s.strip() for s in sentences if len(s.strip()) > 30]
     
     # Clean up points
     cleaned = []
     for p in points:
         # Remove markdown formatting
-        p = re.sub(r'\*\*([^*]+)\*\*', r'\1', p)
-        p = re.sub(r'\*([^*]+)\*', r'\1', p)
-        p = re.sub(r'#{1,3}\s*', '', p)
+        p = strip_markdown(p, max_header_level=3)
         p = p.strip()
         if len(p) > 30 and p not in cleaned:
             cleaned.append(p)
@@ -129,40 +191,15 @@ def _extract_points(text: str) -> list[str]:
     return cleaned[:15]  # Limit to 15 points
 
 
-def _classify_point(text: str, topic: str) -> ResearchPoint:
-    """Classify a single research point."""
+def _classify(text: str) -> tuple[str, float, bool]:
+    """Classify a research point as (classification, confidence, has_statistic)."""
     text_lower = text.lower()
     
-    # Pro indicators
-    pro_words = [
-        "benefit", "advantage", "positive", "improve", "success",
-        "help", "support", "growth", "increase", "better",
-        "opportunity", "solution", "effective", "efficient",
-        "progress", "innovation", "advancement", "gain",
-    ]
-    
-    # Con indicators
-    con_words = [
-        "problem", "risk", "negative", "concern", "issue",
-        "challenge", "threat", "danger", "harm", "cost",
-        "failure", "decline", "decrease", "worse", "obstacle",
-        "criticism", "controversy", "disadvantage", "drawback",
-    ]
-    
-    # Neutral/fact indicators
-    fact_words = [
-        "according to", "research shows", "study found",
-        "data indicates", "statistics show", "report",
-        "survey", "analysis", "evidence", "findings",
-    ]
-    
     # Check for statistics
-    has_stat = bool(re.search(r'\d+[\d,\.]*\s*(%|percent|million|billion)', text_lower))
+    has_stat = _STAT_RE.search(text_lower) is not None
     
     # Count matches
-    pro_score = sum(1 for w in pro_words if w in text_lower)
-    con_score = sum(1 for w in con_words if w in text_lower)
-    fact_score = sum(1 for w in fact_words if w in text_lower)
+    pro_score, con_score, fact_score = _indicator_scores(text_lower)
     
     # Determine classification
     if fact_score >= 1 and pro_score < 2 and con_score < 2:
@@ -181,6 +218,12 @@ def _classify_point(text: str, topic: str) -> ResearchPoint:
         classification = "neutral"
         confidence = 0.3
     
+    return classification, confidence, has_stat
+
+
+def _classify_point(text: str, topic: str) -> ResearchPoint:
+    """Classify a single research point."""
+    classification, confidence, has_stat = _classify(text)
     return ResearchPoint(
         text=text,
         classification=classification,
@@ -192,13 +235,13 @@ def _classify_point(text: str, topic: str) -> ResearchPoint:
 def _extract_sources(text: str) -> list[str]:
     """Extract URLs and source references from text."""
     # Find URLs
-    urls = re.findall(r'https?://[^\s\)]+', text)
+    urls = _URL_RE.findall(text)
     
     # Find "Source:" references
-    sources = re.findall(r'Source:\s*([^\n]+)', text)
+    sources = _SOURCE_RE.findall(text)
     
-    # Combine and deduplicate
-    all_sources = list(set(urls + sources))
+    # Combine and deduplicate, keeping first-seen order
+    all_sources = dict.fromkeys(chain(urls, sources))
     return [s.strip() for s in all_sources if s.strip()]
 
 
@@ -7,6 +7,8 @@ to enable domain-specific adapter loading.
 
 from crewai import Agent
 
+from src.utils.keyword_matching import DomainKeywordMatcher
+
 
 DOMAIN_KEYWORDS = {
     "education": [
@@ -32,6 +34,12 @@ DOMAIN_KEYWORDS = {
 }
 
 
+# Reciprocal keyword counts, so scoring multiplies instead of dividing
+_DOMAIN_DENOM = {domain: 1.0 / len(keywords) for domain, keywords in DOMAIN_KEYWORDS.items()}
+
+_DOMAIN_MATCHER = DomainKeywordMatcher(DOMAIN_KEYWORDS)
+
+
 def classify_domain(topic: str) -> tuple[str, float]:
     """
     Classify a topic into a domain.
@@ -43,14 +51,15 @@ def classify_domain(topic: str) -> tuple[str, float]:
         Tuple of (domain, confidence)
     """
     topic_lower = topic.lower()
-    scores = {}
     
-    for domain, keywords in DOMAIN_KEYWORDS.items():
-        matches = sum(1 for kw in keywords if kw in topic_lower)
-        scores[domain] = matches / len(keywords)
+    # Each keyword counts once however often it occurs
+    matches = _DOMAIN_MATCHER.domain_counts(topic_lower)
     
-    best_domain = max(scores, key=scores.get)
-    confidence = scores[best_domain]
+    # Scale each count by its domain's keyword share; first domain wins ties
+    best_domain, confidence = max(
+        ((domain, count * _DOMAIN_DENOM[domain]) for domain, count in matches.items()),
+        key=lambda item: item[1],
+    )
     
     # Default to "debate" (general) if confidence too low
     if confidence < 0.05:
@@ -5,12 +5,68 @@ Uses research tools to gather information and generates
 structured lessons for users who want to learn about a subject.
 """
 
+import re
 from dataclasses import dataclass
+from typing import Iterator
 from crewai import Agent
 
 from src.crew.tools.internet_research import InternetResearchTool
 from src.crew.tools.wikipedia_tool import WikipediaSearchTool
 
+# A "## Header" line and the section body up to the next "## " (which, as
+# with re.split, also ends the header if it appears mid-line)
+_SECTION_RE = re.compile(r'##\s+((?:(?!##\s)[^\n])*)\n?(.*?)(?=##\s+|\Z)', re.DOTALL)
+
+# A section line starting with a number or bullet; the group is the item
+# text with the leading numbering/bullet characters and whitespace removed
+_ITEM_RE = re.compile(r'^[^\S\n]*(?=[\d-])[0-9.\-) ]*(.*?)[^\S\n]*$', re.MULTILINE)
+
+# Extra guidance appended to the lesson prompt per detail level
+LESSON_LEVEL_INSTRUCTIONS = {
+    "beginner": "Use simple language and basic concepts. Avoid jargon.",
+    "intermediate": "Include moderate detail and some technical terms with explanations.",
+    "advanced": "Include technical depth, nuanced analysis, and advanced concepts.",
+}
+
+# Lesson prompt; only the instruction, topic and context vary per call
+_LESSON_PROMPT_TMPL = """<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+
+You are an expert educator. Create a structured lesson on the given topic.
+
+FORMAT YOUR RESPONSE AS:
+## Overview
+(2-3 paragraph introduction to the topic)
+
+## Key Concepts
+1. Concept name: Explanation
+2. Concept name: Explanation
+(3-5 key concepts)
+
+## Examples
+- Example 1: Description
+- Example 2: Description
+(2-3 concrete examples)
+
+## Further Reading
+1. Resource title - brief description
+(2-3 suggestions)
+
+## Quick Quiz
+1. Question?
+2. Question?
+(2-3 review questions)
+
+{instruction}<|eot_id|><|start_header_id|>user<|end_header_id|>
+
+TOPIC: {topic}
+
+RESEARCH CONTEXT:
+{context}
+
+Create a comprehensive lesson on this topic.<|eot_id|><|start_header_id|>assistant<|end_header_id|>
+
+"""
+
 
 @dataclass
 class Lesson:
@@ -83,52 +139,29 @@ def generate_lesson_prompt(
     Returns:
         Formatted prompt for lesson generation
     """
-    level_instructions = {
-        "beginner": "Use simple language and basic concepts. Avoid jargon.",
-        "intermediate": "Include moderate detail and some technical terms with explanations.",
-        "advanced": "Include technical depth, nuanced analysis, and advanced concepts.",
-    }
-    
-    instruction = level_instructions.get(detail_level, level_instructions["intermediate"])
+    instruction = LESSON_LEVEL_INSTRUCTIONS.get(
+        detail_level, LESSON_LEVEL_INSTRUCTIONS["intermediate"]
+    )
     
-    prompt = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
-
-You are an expert educator. Create a structured lesson on the given topic.
-
-FORMAT YOUR RESPONSE AS:
-## Overview
-(2-3 paragraph introduction to the topic)
-
-## Key Concepts
-1. Concept name: Explanation
-2. Concept name: Explanation
-(3-5 key concepts)
-
-## Examples
-- Example 1: Description
-- Example 2: Description
-(2-3 concrete examples)
-
-## Further Reading
-1. Resource title - brief description
-(2-3 suggestions)
-
-## Quick Quiz
-1. Question?
-2. Question?
-(2-3 review questions)
-
-{instruction}<|eot_id|><|start_header_id|>user<|end_header_id|>
-
-TOPIC: {topic}
+    return _LESSON_PROMPT_TMPL.format_map({
+        "instruction": instruction,
+        "topic": topic,
+        "context": research_context[:2000],
+    })
 
-RESEARCH CONTEXT:
-{research_context[:2000]}
-
-Create a comprehensive lesson on this topic.<|eot_id|><|start_header_id|>assistant<|end_header_id|>
 
-"""
-    return prompt
+def _iter_sections(response: str) -> Iterator[tuple[str, str]]:
+    """
+    Yield (header, body) per lesson section, starting with the text before
+    the first "## " header (its first line acts as the header).
+    """
+    first = _SECTION_RE.search(response)
+    preamble = response[:first.start()] if first else response
+    header, _, body = preamble.partition('\n')
+    yield header, body
+    
+    for section in _SECTION_RE.finditer(response):
+        yield section.group(1), section.group(2)
 
 
 def parse_lesson_response(response: str, topic: str) -> Lesson:
@@ -142,8 +175,6 @@ def parse_lesson_response(response: str, topic: str) -> Lesson:
     Returns:
         Structured Lesson object
     """
-    import re
-    
     # Extract sections using headers
     overview = ""
     key_concepts = []
@@ -152,41 +183,33 @@ def parse_lesson_response(response: str, topic: str) -> Lesson:
     quiz_questions = []
     
     # Simple parsing (in practice, use more robust parsing)
-    sections = re.split(r'##\s+', response)
-    
-    for section in sections:
-        section_lower = section.lower()
-        lines = section.strip().split('\n')
+    for header, body in _iter_sections(response):
+        header = header.lower()
+        
+        if header.startswith('overview'):
+            overview = body.strip()
+            continue
         
-        if section_lower.startswith('overview'):
-            overview = '\n'.join(lines[1:]).strip()
+        # Numbered or bulleted lines of the section body
+        items = _ITEM_RE.findall(body)
         
-        elif section_lower.startswith('key concept'):
-            for line in lines[1:]:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    key_concepts.append(line.lstrip('0123456789.-) '))
+        if header.startswith('key concept'):
+            key_concepts.extend(items)
         
-        elif section_lower.startswith('example'):
-            for line in lines[1:]:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    examples.append(line.lstrip('0123456789.-) '))
+        elif header.startswith('example'):
+            examples.extend(items)
         
-        elif section_lower.startswith('further') or section_lower.startswith('reading'):
-            for line in lines[1:]:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    further_reading.append({
-                        "title": line.lstrip('0123456789.-) '),
-                        "url": "",  # Would need actual URL extraction
-                    })
+        elif header.startswith('further') or header.startswith('reading'):
+            further_reading.extend(
+                {
+                    "title": item,
+                    "url": "",  # Would need actual URL extraction
+                }
+                for item in items
+            )
         
-        elif section_lower.startswith('quiz') or section_lower.startswith('question'):
-            for line in lines[1:]:
-                line = line.strip()
-                if line and (line[0].isdigit() or line.startswith('-')):
-                    quiz_questions.append(line.lstrip('0123456789.-) '))
+        elif header.startswith('quiz') or header.startswith('question'):
+            quiz_questions.extend(items)
     
     return Lesson(
         topic=topic,
@@ -9,13 +9,18 @@ Responsibilities:
 """
 
 from dataclasses import dataclass, field
+from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 import re
+import time
 
+from src.utils.keyword_matching import DomainKeywordMatcher
 
-@dataclass
+
+@dataclass(frozen=True)
 class TopicAnalysis:
-    """Result of topic analysis."""
+    """Result of topic analysis (shared between callers, so read-only)."""
     original_topic: str
     corrected_topic: str
     research_queries: list[str]
@@ -23,6 +28,7 @@ class TopicAnalysis:
     key_terms: list[str]
     domain_hint: str
     is_well_formed: bool
+    search_query: str  # Top key terms joined, for quick searches
 
 
 # Common grammar corrections for debate topics
@@ -53,11 +59,93 @@ GRAMMAR_CORRECTIONS = {
     "pollusion": "pollution",
 }
 
+# Minor words left lowercase when title-casing a topic
+TITLE_STOP_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+})
+
+# Words never treated as key terms
+KEY_TERM_STOP_WORDS = frozenset({
+    "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for",
+    "of", "with", "by", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "do", "does", "did", "will", "would", "could",
+    "should", "may", "might", "must", "shall", "can", "need", "dare",
+    "ought", "used", "better", "best", "more", "most", "other", "such",
+    "no", "not", "only", "own", "same", "so", "than", "too", "very",
+    "just", "also", "now", "here", "there", "when", "where", "why", "how",
+    "all", "each", "every", "both", "few", "more", "most", "some", "any",
+})
+
+# Year stamped into research queries, refreshed daily by _current_year
+_YEAR_REFRESH_SECONDS = 24 * 60 * 60
+_year_cache = {"year": datetime.now().year, "checked_at": time.monotonic()}
+
+# Domain-specific expert types for persona search
+PERSONA_EXPERT_TYPES = {
+    "economics": ("economist", "economic professor", "financial analyst"),
+    "environment": ("environmental scientist", "climate researcher", "ecologist"),
+    "technology": ("technology researcher", "AI expert", "computer scientist"),
+    "healthcare": ("medical researcher", "public health expert", "physician"),
+    "education": ("education professor", "learning researcher"),
+    "politics": ("political scientist", "policy analyst", "political commentator"),
+    "energy": ("energy researcher", "renewable energy expert", "engineer"),
+    "social": ("sociologist", "social policy expert", "civil rights advocate"),
+    "general": ("professor", "researcher", "analyst", "expert"),
+}
+
+# Candidate key terms: whole words of 3+ letters
+_KEY_TERM_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
+
+# All misspellings in one alternation, longest first so no key shadows another
+_CORRECTION_RE = re.compile(
+    r'\b(?:'
+    + '|'.join(map(re.escape, sorted(GRAMMAR_CORRECTIONS, key=len, reverse=True)))
+    + r')\b',
+    re.IGNORECASE,
+)
+
+
+def _correction_for(match: re.Match) -> str:
+    """Replacement callback for _CORRECTION_RE."""
+    return GRAMMAR_CORRECTIONS[match.group(0).lower()]
+
+
+# A word with the whitespace before it, or trailing whitespace on its own
+_TITLE_WORD_RE = re.compile(r'\s*(\S+)|\s+')
+
+
+def _title_word(match: re.Match) -> str:
+    """Replacement callback for _TITLE_WORD_RE (collapses whitespace like split/join)."""
+    word = match.group(1)
+    if word is None:
+        return ""
+    if match.start() == 0:
+        return word.capitalize()
+    return " " + (word if word in TITLE_STOP_WORDS else word.capitalize())
+
+
+# Keywords used to detect the domain hint of a topic
+DOMAIN_HINT_KEYWORDS = {
+    "economics": ["economy", "economic", "tax", "taxes", "trade", "market", "gdp", "inflation", "jobs", "employment", "wage", "tariff"],
+    "environment": ["climate", "environment", "pollution", "carbon", "emissions", "green", "renewable", "sustainability", "ecology"],
+    "technology": ["ai", "artificial", "intelligence", "technology", "tech", "digital", "internet", "software", "automation", "robot"],
+    "healthcare": ["health", "healthcare", "medical", "medicine", "hospital", "doctor", "patient", "disease", "vaccine"],
+    "education": ["education", "school", "university", "student", "teacher", "learning", "curriculum", "college"],
+    "politics": ["government", "political", "policy", "law", "regulation", "democracy", "vote", "election", "congress", "president"],
+    "energy": ["energy", "electric", "battery", "solar", "wind", "nuclear", "oil", "gas", "fuel", "power"],
+    "social": ["social", "society", "rights", "equality", "justice", "freedom", "immigration", "crime"],
+}
+
+_DOMAIN_HINT_MATCHER = DomainKeywordMatcher(DOMAIN_HINT_KEYWORDS)
 
+
+@lru_cache(maxsize=256)
 def analyze_topic(topic: str) -> TopicAnalysis:
     """
     Analyze and prepare a debate topic for the pipeline.
     
+    Results are cached per topic; callers must not mutate the returned lists.
+    
     Args:
         topic: Raw user-provided topic
         
@@ -69,17 +157,24 @@ def analyze_topic(topic: str) -> TopicAnalysis:
     # Step 1: Correct common grammar/spelling mistakes
     corrected = _correct_grammar(original)
     
+    # Lowercase once for key term extraction and domain detection
+    corrected_lower = corrected.lower()
+    
     # Step 2: Extract key terms
-    key_terms = _extract_key_terms(corrected)
+    key_terms = _extract_key_terms(corrected_lower)
     
     # Step 3: Detect domain
-    domain_hint = _detect_domain(corrected, key_terms)
+    domain_hint = _detect_domain(corrected_lower)
+    
+    # Join the leading key terms once for the query generators
+    main_terms_3 = " ".join(key_terms[:3])
+    main_terms_2 = " ".join(key_terms[:2])
     
     # Step 4: Generate optimized research queries
-    research_queries = _generate_research_queries(corrected, key_terms)
+    research_queries = _generate_research_queries(corrected, main_terms_3)
     
     # Step 5: Generate persona search queries
-    persona_queries = _generate_persona_queries(corrected, key_terms, domain_hint)
+    persona_queries = _generate_persona_queries(corrected, main_terms_2, domain_hint)
     
     # Step 6: Check if topic is well-formed
     is_well_formed = len(key_terms) >= 2 and len(corrected) >= 10
@@ -92,6 +187,7 @@ def analyze_topic(topic: str) -> TopicAnalysis:
         key_terms=key_terms,
         domain_hint=domain_hint,
         is_well_formed=is_well_formed,
+        search_query=" ".join(key_terms[:4]),
     )
 
 
@@ -99,82 +195,55 @@ def _correct_grammar(topic: str) -> str:
     """Apply common grammar/spelling corrections."""
     corrected = topic.lower()
     
-    # Apply known corrections
-    for wrong, right in GRAMMAR_CORRECTIONS.items():
-        corrected = re.sub(rf'\b{wrong}\b', right, corrected, flags=re.IGNORECASE)
+    # Apply known corrections (most topics have none, so probe first)
+    if _CORRECTION_RE.search(corrected):
+        corrected = _CORRECTION_RE.sub(_correction_for, corrected)
     
     # Capitalize first letter of each major word for display
-    words = corrected.split()
-    stop_words = {"a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by"}
-    
-    capitalized = []
-    for i, word in enumerate(words):
-        if i == 0 or word not in stop_words:
-            capitalized.append(word.capitalize())
-        else:
-            capitalized.append(word)
-    
-    return " ".join(capitalized)
-
-
-def _extract_key_terms(topic: str) -> list[str]:
-    """Extract important keywords from the topic."""
-    # Remove common stop words
-    stop_words = {
-        "a", "an", "the", "and", "or", "but", "in", "on", "at", "to", "for",
-        "of", "with", "by", "is", "are", "was", "were", "be", "been", "being",
-        "have", "has", "had", "do", "does", "did", "will", "would", "could",
-        "should", "may", "might", "must", "shall", "can", "need", "dare",
-        "ought", "used", "better", "best", "more", "most", "other", "such",
-        "no", "not", "only", "own", "same", "so", "than", "too", "very",
-        "just", "also", "now", "here", "there", "when", "where", "why", "how",
-        "all", "each", "every", "both", "few", "more", "most", "some", "any",
-    }
-    
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', topic.lower())
-    key_terms = [w for w in words if w not in stop_words]
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_terms = []
-    for term in key_terms:
-        if term not in seen:
-            seen.add(term)
-            unique_terms.append(term)
-    
-    return unique_terms[:6]  # Limit to 6 key terms
-
-
-def _detect_domain(topic: str, key_terms: list[str]) -> str:
-    """Detect the domain/category of the topic."""
-    topic_lower = topic.lower()
-    terms_str = " ".join(key_terms)
-    
-    domain_keywords = {
-        "economics": ["economy", "economic", "tax", "taxes", "trade", "market", "gdp", "inflation", "jobs", "employment", "wage", "tariff"],
-        "environment": ["climate", "environment", "pollution", "carbon", "emissions", "green", "renewable", "sustainability", "ecology"],
-        "technology": ["ai", "artificial", "intelligence", "technology", "tech", "digital", "internet", "software", "automation", "robot"],
-        "healthcare": ["health", "healthcare", "medical", "medicine", "hospital", "doctor", "patient", "disease", "vaccine"],
-        "education": ["education", "school", "university", "student", "teacher", "learning", "curriculum", "college"],
-        "politics": ["government", "political", "policy", "law", "regulation", "democracy", "vote", "election", "congress", "president"],
-        "energy": ["energy", "electric", "battery", "solar", "wind", "nuclear", "oil", "gas", "fuel", "power"],
-        "social": ["social", "society", "rights", "equality", "justice", "freedom", "immigration", "crime"],
-    }
-    
-    for domain, keywords in domain_keywords.items():
-        matches = sum(1 for kw in keywords if kw in topic_lower or kw in terms_str)
-        if matches >= 2:
+    return _TITLE_WORD_RE.sub(_title_word, corrected)
+
+
+def _extract_key_terms(topic_lower: str) -> list[str]:
+    """Extract important keywords from the lowercased topic."""
+    # Ordered dedup, stopping as soon as 6 key terms are found
+    key_terms = {}
+    for match in _KEY_TERM_RE.finditer(topic_lower):
+        term = match.group()
+        if term in KEY_TERM_STOP_WORDS or term in key_terms:
+            continue
+        key_terms[term] = None
+        if len(key_terms) == 6:  # Limit to 6 key terms
+            break
+    
+    return list(key_terms)
+
+
+def _detect_domain(topic_lower: str) -> str:
+    """Detect the domain/category of the lowercased topic."""
+    # Key terms are words of topic_lower and keywords contain no spaces, so
+    # scanning the topic alone also covers the key terms
+    matches = _DOMAIN_HINT_MATCHER.domain_counts(topic_lower)
+    
+    # First domain (in table order) with enough matches wins
+    for domain in DOMAIN_HINT_KEYWORDS:
+        if matches[domain] >= 2:
             return domain
     
     return "general"
 
 
-def _generate_research_queries(topic: str, key_terms: list[str]) -> list[str]:
-    """Generate optimized search queries for research."""
-    from datetime import datetime
-    current_year = datetime.now().year
-    
-    main_terms = " ".join(key_terms[:3])
+def _current_year() -> int:
+    """Return the current year, re-reading the clock at most once a day."""
+    now = time.monotonic()
+    if now - _year_cache["checked_at"] > _YEAR_REFRESH_SECONDS:
+        _year_cache["year"] = datetime.now().year
+        _year_cache["checked_at"] = now
+    return _year_cache["year"]
+
+
+def _generate_research_queries(topic: str, main_terms: str) -> list[str]:
+    """Generate optimized search queries for research from the top 3 key terms."""
+    current_year = _current_year()
     
     queries = [
         # Pro/Con perspectives
@@ -194,35 +263,19 @@ def _generate_research_queries(topic: str, key_terms: list[str]) -> list[str]:
     return queries
 
 
-def _generate_persona_queries(topic: str, key_terms: list[str], domain: str) -> list[str]:
-    """Generate queries for finding debate panelists."""
-    main_terms = " ".join(key_terms[:2])
+def _generate_persona_queries(topic: str, main_terms: str, domain: str) -> list[str]:
+    """Generate queries for finding debate panelists from the top 2 key terms."""
+    expert_roles = PERSONA_EXPERT_TYPES.get(domain, PERSONA_EXPERT_TYPES["general"])
     
-    # Domain-specific expert types
-    expert_types = {
-        "economics": ["economist", "economic professor", "financial analyst"],
-        "environment": ["environmental scientist", "climate researcher", "ecologist"],
-        "technology": ["technology researcher", "AI expert", "computer scientist"],
-        "healthcare": ["medical researcher", "public health expert", "physician"],
-        "education": ["education professor", "learning researcher"],
-        "politics": ["political scientist", "policy analyst", "political commentator"],
-        "energy": ["energy researcher", "renewable energy expert", "engineer"],
-        "social": ["sociologist", "social policy expert", "civil rights advocate"],
-        "general": ["professor", "researcher", "analyst", "expert"],
-    }
-    
-    expert_roles = expert_types.get(domain, expert_types["general"])
-    
-    queries = []
-    for role in expert_roles[:2]:
-        queries.append(f"{main_terms} {role} notable")
-        queries.append(f"famous {role} {main_terms}")
+    queries = [
+        query
+        for role in expert_roles[:2]
+        for query in (f"{main_terms} {role} notable", f"famous {role} {main_terms}")
+    ]
     
     # Add general expert queries
-    queries.extend([
-        f"who is expert on {topic}",
-        f"{main_terms} notable scholar academic",
-    ])
+    queries.append(f"who is expert on {topic}")
+    queries.append(f"{main_terms} notable scholar academic")
     
     return queries[:6]
 
@@ -235,5 +288,4 @@ def correct_and_expand_topic(topic: str) -> tuple[str, str]:
         Tuple of (corrected_topic, search_query)
     """
     analysis = analyze_topic(topic)
-    search_query = " ".join(analysis.key_terms[:4])
-    return (analysis.corrected_topic, search_query)
+    return (analysis.corrected_topic, analysis.search_query)
@@ -12,6 +12,18 @@ from dataclasses import dataclass
 from typing import Optional
 import re
 
+from src.utils.markdown import strip_markdown
+
+# Meta-commentary the model sometimes wraps around the introduction
+_META_RE = re.compile(
+    r'Here is (?:the |my |a )?introduction.*?:'
+    r'|Introduction:'
+    r'|Note:.*?(?=\n|$)',
+    re.IGNORECASE,
+)
+
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
 
 @dataclass
 class DebateIntroduction:
@@ -190,21 +202,13 @@ def _clean_host_output(text: str) -> str:
         return ""
     
     # Remove markdown formatting
-    text = re.sub(r'\*\*([^*]+)\*\*', r'\1', text)
-    text = re.sub(r'\*([^*]+)\*', r'\1', text)
-    text = re.sub(r'#{1,6}\s*', '', text)
+    text = strip_markdown(text)
     
     # Remove meta-commentary
-    remove_patterns = [
-        r'Here is (?:the |my |a )?introduction.*?:',
-        r'Introduction:',
-        r'Note:.*?(?=\n|$)',
-    ]
-    for pattern in remove_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
+    text = _META_RE.sub('', text)
     
     # Clean whitespace
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     text = text.strip()
     
     return text
@@ -25,7 +25,7 @@ from src.crew.tools.debate_tool import DebateGenerationTool, DebateTurn
 from src.crew.agents.router_agent import create_router_agent, classify_domain
 from src.crew.agents.research_agent import create_research_agent
 from src.crew.agents.debater_agents import create_pro_debater_agent, create_con_debater_agent
-from src.crew.agents.factcheck_agent import create_factcheck_agent, compute_faithfulness_score
+from src.crew.agents.factcheck_agent import create_factcheck_agent, compute_faithfulness_batch
 from src.crew.agents.judge_agent import create_judge_agent, judge_debate, JudgeScore
 from src.crew.agents.persona_agent import create_persona_agent, recommend_debate_guests, DebateGuest
 from src.crew.agents.topic_analyst import analyze_topic, TopicAnalysis
@@ -478,10 +478,10 @@ class DebateCrew:
         pro_combined = " ".join(pro_arguments)
         con_combined = " ".join(con_arguments)
         
-        return {
-            "pro": compute_faithfulness_score(pro_combined, research_context),
-            "con": compute_faithfulness_score(con_combined, research_context),
-        }
+        pro_score, con_score = compute_faithfulness_batch(
+            [pro_combined, con_combined], research_context
+        )
+        return {"pro": pro_score, "con": con_score}
     
     def _save_debate(self, result: DebateResult):
         """Save debate artifacts to disk."""
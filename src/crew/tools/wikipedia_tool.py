@@ -319,7 +319,11 @@ class WikipediaSearchTool(BaseTool):
         Returns:
             List of Person objects suitable for debate panel
         """
-        results = self._search_experts(topic)
+        # Share the session cache with _run so repeated queries skip the network
+        results = self._cache.get(topic, "experts")
+        if results is None:
+            results = self._search_experts(topic)
+            self._cache.set(topic, "experts", results)
         
         people = []
         for p in results.get("people", []):
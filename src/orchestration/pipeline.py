@@ -12,7 +12,7 @@ from typing import Callable
 from src.agents.base import Agent, AgentState, DebateContext
 from src.agents.router import DomainRouterAgent
 from src.agents.research import ResearchAgent
-from src.agents.debater import DebaterAgent
+from src.agents.debater import DebaterAgent, DebateRoundAgent
 from src.agents.factcheck import FactCheckAgent
 from src.agents.judge import JudgeAgent
 from src.agents.logger import LoggerAgent
@@ -38,6 +38,13 @@ class DebatePipeline:
         model=None,
         tokenizer=None,
         use_adapter: bool = True,
+        batch_rounds: bool = False,
+        backend: str = "hf",
+        merge_adapter: bool = False,
+        stream_factcheck: bool = False,
+        do_sample: bool = True,
+        draft_model=None,
+        n_samples: int = 1,
     ):
         """
         Initialize the debate pipeline.
@@ -47,25 +54,51 @@ class DebatePipeline:
             model: Pre-loaded model (optional)
             tokenizer: Pre-loaded tokenizer (optional)
             use_adapter: Whether to use domain adapters
+            batch_rounds: Generate pro and con of each round in one batched
+                call (con no longer sees the same-round pro argument)
+            backend: Generation backend for debaters ("hf" or "vllm")
+            merge_adapter: Merge domain adapters into the base weights
+                instead of applying them at runtime (hf backend only)
+            stream_factcheck: Fact-check each argument while it is being
+                generated instead of in a separate pass (hf backend only)
+            do_sample: Sample arguments; False decodes greedily
+            draft_model: Draft model for speculative decoding (a loaded
+                model for hf, a model path for vllm)
+            n_samples: Arguments sampled per turn; the best-supported one
+                is kept
         """
         self.output_dir = output_dir or Path("runs/debates")
 
         # Initialize agents
         self.router = DomainRouterAgent()
         self.research = ResearchAgent()
+        self.factcheck = FactCheckAgent()
+        streaming_factcheck = self.factcheck if stream_factcheck else None
         self.debater_pro = DebaterAgent(
             stance="pro",
             model=model,
             tokenizer=tokenizer,
             use_adapter=use_adapter,
+            backend=backend,
+            merge_adapter=merge_adapter,
+            factcheck=streaming_factcheck,
+            do_sample=do_sample,
+            draft_model=draft_model,
+            n_samples=n_samples,
         )
         self.debater_con = DebaterAgent(
             stance="con",
             model=model,
             tokenizer=tokenizer,
             use_adapter=use_adapter,
+            backend=backend,
+            merge_adapter=merge_adapter,
+            factcheck=streaming_factcheck,
+            do_sample=do_sample,
+            draft_model=draft_model,
+            n_samples=n_samples,
         )
-        self.factcheck = FactCheckAgent()
+        self.debate_round = DebateRoundAgent(self.debater_pro, self.debater_con)
         self.judge = JudgeAgent()
         self.logger = LoggerAgent(output_dir=self.output_dir)
 
@@ -79,6 +112,8 @@ class DebatePipeline:
             AgentState.JUDGING: self.judge,
             AgentState.LOGGING: self.logger,
         }
+        if batch_rounds:
+            self.state_handlers[AgentState.DEBATING_PRO] = self.debate_round
 
         # Hooks for monitoring
         self.on_state_change: Callable[[DebateContext], None] | None = None
@@ -126,7 +161,8 @@ class DebatePipeline:
         Args:
             topic: The debate topic
             num_rounds: Number of pro/con exchange rounds
-            verbose: Print progress to stdout
+            verbose: Print progress to stdout and record agent actions
+                in context.agent_logs
 
         Returns:
             Completed DebateContext with all results
@@ -136,6 +172,7 @@ class DebatePipeline:
             topic=topic,
             num_rounds=num_rounds,
             current_state=AgentState.ROUTING,
+            verbose=verbose,
         )
 
         if verbose:
@@ -7,24 +7,40 @@ Provides functions to load JSONL datasets and prepare them for training.
 import json
 from pathlib import Path
 from datasets import Dataset
+from trl import pack_dataset
+
+
+def iter_jsonl_records(path: str, mtime_ns: int = 0):
+    """
+    Yield records from a JSONL file one at a time.
+
+    ``mtime_ns`` is unused by the generator itself; it is part of the
+    ``gen_kwargs`` so the datasets cache is invalidated when the file changes.
+    """
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def load_jsonl_dataset(path: Path) -> Dataset:
+    """Stream a JSONL file straight into an Arrow-backed Dataset."""
+    path = Path(path)
+    return Dataset.from_generator(
+        iter_jsonl_records,
+        gen_kwargs={"path": str(path), "mtime_ns": path.stat().st_mtime_ns},
+    )
 
 
 def load_debate_jsonl(path: Path) -> Dataset:
     """Load a JSONL debate dataset into HuggingFace Dataset format."""
-    records = []
-    with open(path) as f:
-        for line in f:
-            records.append(json.loads(line))
-    return Dataset.from_list(records)
+    return load_jsonl_dataset(path)
 
 
 def load_sft_jsonl(path: Path) -> Dataset:
     """Load a JSONL SFT dataset with a text field."""
-    records = []
-    with open(path) as f:
-        for line in f:
-            records.append(json.loads(line))
-    return Dataset.from_list(records)
+    return load_jsonl_dataset(path)
 
 
 def format_debate_prompt(example: dict) -> str:
@@ -116,12 +132,38 @@ def prepare_sft_dataset_for_training(
     dataset: Dataset,
     tokenizer,
     max_length: int = 512,
+    packing: bool = False,
 ) -> Dataset:
     """
     Tokenize and prepare SFT dataset for causal LM training.
 
     Expects a "text" field containing chat-formatted content.
+
+    With ``packing=True`` examples are EOS-separated, concatenated and cut
+    into ``max_length`` blocks, so no compute is spent on padding tokens.
     """
+    if packing:
+        def tokenize_function(examples):
+            texts = examples.get("text", [])
+            tokenized = tokenizer(texts, add_special_tokens=True)
+            for ids, mask in zip(tokenized["input_ids"], tokenized["attention_mask"]):
+                ids.append(tokenizer.eos_token_id)
+                mask.append(1)
+            return tokenized
+
+        tokenized = dataset.map(
+            tokenize_function,
+            batched=True,
+            remove_columns=dataset.column_names,
+            desc="Tokenizing"
+        )
+        packed = pack_dataset(tokenized, seq_length=max_length, strategy="wrapped")
+        return packed.map(
+            lambda examples: {"labels": [ids.copy() for ids in examples["input_ids"]]},
+            batched=True,
+            desc="Packing"
+        )
+
     def tokenize_function(examples):
         texts = examples.get("text", [])
         tokenized = tokenizer(
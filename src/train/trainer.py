@@ -59,6 +59,24 @@ def compute_perplexity(loss: float) -> float:
     return math.exp(loss)
 
 
+def configure_torch_compile() -> bool:
+    """
+    Prepare torch.compile for training and report whether it can be used.
+
+    Requires CUDA and torch>=2.2. Enables TF32 matmuls and raises the
+    dynamo recompile limit so the LoRA-wrapped layers don't fall back to
+    eager mode.
+    """
+    if not torch.cuda.is_available() or not hasattr(torch, "compile"):
+        return False
+    try:
+        torch.set_float32_matmul_precision("high")
+        torch._dynamo.config.cache_size_limit = 64
+    except (AttributeError, RuntimeError):
+        return False
+    return True
+
+
 def get_training_arguments(
     output_dir: Path,
     num_epochs: int = 3,
@@ -71,6 +89,10 @@ def get_training_arguments(
     save_steps: int = 100,
     dataloader_num_workers: int = 0,
     dataloader_pin_memory: bool = False,
+    dataloader_persistent_workers: bool = False,
+    dataloader_prefetch_factor: Optional[int] = None,
+    torch_compile: bool = False,
+    optim: str = "paged_adamw_8bit",
 ) -> TrainingArguments:
     """
     Get training arguments optimized for QLoRA training on RTX 3090.
@@ -85,10 +107,18 @@ def get_training_arguments(
         logging_steps: Log metrics every N steps
         eval_steps: Evaluate every N steps
         save_steps: Save checkpoint every N steps
+        dataloader_num_workers: Worker processes for batch loading (0 = main process)
+        dataloader_pin_memory: Pin host memory for async host-to-device copies
+        dataloader_persistent_workers: Keep workers alive between train/eval passes
+        dataloader_prefetch_factor: Batches prefetched per worker (needs workers > 0)
+        torch_compile: Compile the model with torch.compile before training
+        optim: Optimizer name; the 8-bit paged AdamW keeps moments in int8
 
     Returns:
         TrainingArguments configured for QLoRA
     """
+    use_bf16 = torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+
     return TrainingArguments(
         output_dir=str(output_dir),
         num_train_epochs=num_epochs,
@@ -106,14 +136,21 @@ def get_training_arguments(
         load_best_model_at_end=True,
         metric_for_best_model="eval_loss",
         greater_is_better=False,
-        fp16=True,
-        bf16=False,  # Use fp16 for RTX 3090 compatibility
+        fp16=not use_bf16,
+        bf16=use_bf16,
         gradient_checkpointing=True,
-        optim="paged_adamw_8bit",
+        gradient_checkpointing_kwargs={"use_reentrant": False},
+        optim=optim,
         report_to="none",  # No external logging (local only)
         dataloader_num_workers=dataloader_num_workers,
         dataloader_pin_memory=dataloader_pin_memory,
+        dataloader_persistent_workers=dataloader_num_workers > 0 and dataloader_persistent_workers,
+        dataloader_prefetch_factor=dataloader_prefetch_factor if dataloader_num_workers > 0 else None,
         remove_unused_columns=False,
+        torch_compile=torch_compile,
+        # CUDA graphs ("reduce-overhead") clash with gradient checkpointing
+        # recomputation and paged optimizer state, so use kernel fusion only.
+        torch_compile_mode="default" if torch_compile else None,
     )
 
 
@@ -0,0 +1,95 @@
+"""
+Keyword matching helpers shared by the rule-based agents.
+
+Wraps the optional pyahocorasick dependency: build_automaton returns None
+when it isn't installed, and callers fall back to plain substring checks.
+DomainKeywordMatcher scores text against per-domain keyword tables.
+"""
+
+import re
+from typing import Any, Iterable
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+def build_automaton(entries: Iterable[tuple[str, Any]]):
+    """
+    Build an Aho-Corasick automaton that reports the value of each matched keyword.
+
+    Args:
+        entries: (keyword, value) pairs; a repeated keyword keeps its last value
+
+    Returns:
+        ahocorasick.Automaton, or None if pyahocorasick is not installed
+    """
+    if not AHOCORASICK_AVAILABLE:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword, value in entries:
+        automaton.add_word(keyword, value)
+    automaton.make_automaton()
+    return automaton
+
+
+# Keywords this short only match whole words or their plurals, so that
+# "ai" does not fire on "paid" or "oil" on "turmoil"
+SHORT_KEYWORD_LEN = 3
+_SHORT_KEYWORD_SUFFIXES = ("", "s", "es")
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+class DomainKeywordMatcher:
+    """
+    Counts the distinct keywords of each domain found in lowercased text.
+
+    Keywords longer than SHORT_KEYWORD_LEN match anywhere as substrings
+    (so "student" also hits "students"); shorter ones match whole tokens.
+    """
+
+    def __init__(self, domain_keywords: dict[str, list[str]]):
+        self.domains = list(domain_keywords)
+
+        keyword_domains: dict[str, list[str]] = {}
+        for domain, keywords in domain_keywords.items():
+            for keyword in keywords:
+                keyword_domains.setdefault(keyword, []).append(domain)
+
+        # Token (short keyword or one of its plurals) -> (keyword, domains)
+        self._short_index: dict[str, tuple[str, list[str]]] = {}
+        self._long_keywords: dict[str, list[str]] = {}
+        for keyword, domains in keyword_domains.items():
+            if len(keyword) <= SHORT_KEYWORD_LEN:
+                for suffix in _SHORT_KEYWORD_SUFFIXES:
+                    self._short_index[keyword + suffix] = (keyword, domains)
+            else:
+                self._long_keywords[keyword] = domains
+
+        self._automaton = build_automaton(
+            (keyword, (keyword, domains)) for keyword, domains in self._long_keywords.items()
+        )
+
+    def domain_counts(self, text_lower: str) -> dict[str, int]:
+        """Return {domain: matched keyword count} in table order; repeats count once."""
+        if self._automaton is not None:
+            found = {keyword: domains for _, (keyword, domains) in self._automaton.iter(text_lower)}
+        else:
+            found = {
+                keyword: domains
+                for keyword, domains in self._long_keywords.items()
+                if keyword in text_lower
+            }
+        for token in _TOKEN_RE.findall(text_lower):
+            hit = self._short_index.get(token)
+            if hit is not None:
+                found[hit[0]] = hit[1]
+
+        counts = dict.fromkeys(self.domains, 0)
+        for domains in found.values():
+            for domain in domains:
+                counts[domain] += 1
+        return counts
@@ -0,0 +1,28 @@
+"""
+Markdown cleanup for model output shown as plain text.
+"""
+
+import re
+
+_BOLD_RE = re.compile(r'\*\*([^*]+)\*\*')
+_ITALIC_RE = re.compile(r'\*([^*]+)\*')
+_HEADER_RES = {level: re.compile(r'#{1,%d}\s*' % level) for level in range(1, 7)}
+
+
+def strip_markdown(text: str, max_header_level: int = 6) -> str:
+    """
+    Remove bold, italic and header markers from text.
+
+    Bold is stripped before italic, so ***bold italic*** loses all its
+    asterisks.
+
+    Args:
+        text: Text that may contain markdown
+        max_header_level: Longest run of '#' removed as a header marker (1-6)
+
+    Returns:
+        Text with the markers removed
+    """
+    text = _BOLD_RE.sub(r'\1', text)
+    text = _ITALIC_RE.sub(r'\1', text)
+    return _HEADER_RES[max_header_level].sub('', text)
@@ -5,6 +5,14 @@ Provides standardized functions for loading the base model and LoRA adapters
 in 4-bit quantized mode (QLoRA) for memory-efficient training and inference.
 """
 
+import importlib.util
+import os
+
+# Let the CUDA caching allocator grow and shrink segments instead of
+# fragmenting when models and adapters are swapped. Read at the first CUDA
+# allocation, so it must be set before any model is loaded.
+os.environ.setdefault("PYTORCH_CUDA_ALLOC_CONF", "expandable_segments:True")
+
 import torch
 from pathlib import Path
 from transformers import (
@@ -19,18 +27,57 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 BASE_MODEL_PATH = PROJECT_ROOT / "models" / "base" / "llama3.1-nemotron-nano-8b-v1"
 ADAPTERS_PATH = PROJECT_ROOT / "models" / "adapters"
 
+# All attention and MLP projections of the Llama architecture
+LORA_TARGET_MODULES = [
+    "q_proj",
+    "k_proj",
+    "v_proj",
+    "o_proj",
+    "gate_proj",
+    "up_proj",
+    "down_proj",
+]
+
+
+def get_compute_dtype() -> torch.dtype:
+    """
+    Returns the preferred half-precision dtype for the current GPU.
+
+    BF16 is used on Ampere and newer (RTX 3090 included); older cards
+    fall back to FP16.
+    """
+    if torch.cuda.is_available() and torch.cuda.is_bf16_supported():
+        return torch.bfloat16
+    return torch.float16
+
+
+def get_attn_implementation() -> str:
+    """
+    Returns the fastest available attention implementation.
+
+    FlashAttention-2 is used when the ``flash_attn`` package is installed
+    and the GPU supports BF16; otherwise PyTorch SDPA is used.
+    """
+    if (
+        importlib.util.find_spec("flash_attn") is not None
+        and get_compute_dtype() == torch.bfloat16
+    ):
+        return "flash_attention_2"
+    return "sdpa"
+
 
 def get_bnb_config() -> BitsAndBytesConfig:
     """
     Returns the standard 4-bit quantization config for QLoRA.
 
     Uses NF4 quantization with double quantization for optimal
-    memory efficiency while maintaining model quality.
+    memory efficiency while maintaining model quality. The 4-bit weights
+    are dequantized to BF16 (FP16 on pre-Ampere GPUs) for each matmul.
     """
     return BitsAndBytesConfig(
         load_in_4bit=True,
         bnb_4bit_quant_type="nf4",
-        bnb_4bit_compute_dtype=torch.float16,
+        bnb_4bit_compute_dtype=get_compute_dtype(),
         bnb_4bit_use_double_quant=True,
     )
 
@@ -40,6 +87,7 @@ def get_lora_config(
     lora_alpha: int = 32,
     lora_dropout: float = 0.05,
     target_modules: list[str] | None = None,
+    use_rslora: bool = True,
 ) -> LoraConfig:
     """
     Returns LoRA configuration for adapter training.
@@ -48,13 +96,14 @@ def get_lora_config(
         r: LoRA rank (dimension of low-rank matrices)
         lora_alpha: LoRA scaling factor
         lora_dropout: Dropout probability for LoRA layers
-        target_modules: Which modules to apply LoRA to
+        target_modules: Which modules to apply LoRA to (defaults to all linear layers)
+        use_rslora: Scale by lora_alpha/sqrt(r) (rank-stabilized LoRA)
 
     Returns:
         LoraConfig for PEFT
     """
     if target_modules is None:
-        target_modules = ["q_proj", "v_proj"]
+        target_modules = list(LORA_TARGET_MODULES)
 
     return LoraConfig(
         r=r,
@@ -63,12 +112,14 @@ def get_lora_config(
         lora_dropout=lora_dropout,
         bias="none",
         task_type="CAUSAL_LM",
+        use_rslora=use_rslora,
     )
 
 
 def load_base_model(
     model_path: Path | str | None = None,
     device_map: str = "auto",
+    attn_implementation: str | None = None,
 ) -> tuple[AutoModelForCausalLM, AutoTokenizer]:
     """
     Loads the base model in 4-bit quantized mode.
@@ -76,12 +127,15 @@ def load_base_model(
     Args:
         model_path: Path to model directory (defaults to project base model)
         device_map: Device placement strategy
+        attn_implementation: Attention backend (defaults to the fastest available)
 
     Returns:
         Tuple of (model, tokenizer)
     """
     if model_path is None:
         model_path = BASE_MODEL_PATH
+    if attn_implementation is None:
+        attn_implementation = get_attn_implementation()
 
     model_path = Path(model_path)
 
@@ -106,7 +160,8 @@ def load_base_model(
         quantization_config=get_bnb_config(),
         device_map=device_map,
         trust_remote_code=True,
-        torch_dtype=torch.float16,
+        torch_dtype=get_compute_dtype(),
+        attn_implementation=attn_implementation,
     )
 
     return model, tokenizer
@@ -162,10 +217,15 @@ def get_model_info(model: AutoModelForCausalLM) -> dict:
         "model_type": type(model).__name__,
         "device": str(next(model.parameters()).device),
         "dtype": str(next(model.parameters()).dtype),
+        "attn_implementation": getattr(model.config, "_attn_implementation", None),
         "num_parameters": sum(p.numel() for p in model.parameters()),
         "trainable_parameters": sum(p.numel() for p in model.parameters() if p.requires_grad),
     }
 
+    quantization_config = getattr(model.config, "quantization_config", None)
+    if quantization_config is not None:
+        info["compute_dtype"] = str(quantization_config.bnb_4bit_compute_dtype)
+
     # Check memory usage
     if torch.cuda.is_available():
         info["gpu_memory_allocated_gb"] = torch.cuda.memory_allocated() / 1e9
@@ -0,0 +1,86 @@
+"""
+vLLM engine utilities for the debate simulator.
+
+Provides a single shared in-process vLLM engine (PagedAttention, prefix
+caching) with LoRA support, so every agent that generates text reuses the
+same weights and KV cache pool instead of loading its own model.
+"""
+
+import threading
+
+from src.utils.model_loader import BASE_MODEL_PATH, ADAPTERS_PATH
+
+_ENGINE = None
+_ENGINE_LOCK = threading.Lock()
+_LORA_IDS: dict[str, int] = {}
+
+
+def get_vllm_engine(
+    gpu_memory_utilization: float = 0.9,
+    max_model_len: int = 4096,
+    max_lora_rank: int = 16,
+    speculative_model: str | None = None,
+    num_speculative_tokens: int = 5,
+):
+    """
+    Returns the process-wide vLLM engine, creating it on first use.
+
+    The base model is loaded with bitsandbytes 4-bit quantization and
+    prefix caching, so the shared system/background prompt of a debate is
+    only prefilled once.
+
+    Args:
+        gpu_memory_utilization: Fraction of GPU memory vLLM may reserve
+        max_model_len: Maximum context length (prompt + generation)
+        max_lora_rank: Largest LoRA rank among the domain adapters
+        speculative_model: Optional draft model path for speculative
+            decoding (only used when the engine is first created)
+        num_speculative_tokens: Tokens the draft proposes per step
+
+    Returns:
+        vllm.LLM instance
+    """
+    global _ENGINE
+
+    with _ENGINE_LOCK:
+        if _ENGINE is None:
+            from vllm import LLM
+
+            speculative_config = None
+            if speculative_model:
+                speculative_config = {
+                    "model": str(speculative_model),
+                    "num_speculative_tokens": num_speculative_tokens,
+                }
+
+            _ENGINE = LLM(
+                model=str(BASE_MODEL_PATH),
+                quantization="bitsandbytes",
+                dtype="bfloat16",
+                gpu_memory_utilization=gpu_memory_utilization,
+                max_model_len=max_model_len,
+                enable_prefix_caching=True,
+                enable_lora=True,
+                max_lora_rank=max_lora_rank,
+                speculative_config=speculative_config,
+                trust_remote_code=True,
+            )
+    return _ENGINE
+
+
+def get_lora_request(domain: str):
+    """
+    Returns a LoRARequest for a domain adapter, or None if it doesn't exist.
+
+    Each domain keeps a stable integer ID so vLLM can cache the adapter
+    weights across requests.
+    """
+    adapter_path = ADAPTERS_PATH / domain
+    if not adapter_path.exists():
+        return None
+
+    from vllm.lora.request import LoRARequest
+
+    with _ENGINE_LOCK:
+        lora_id = _LORA_IDS.setdefault(domain, len(_LORA_IDS) + 1)
+    return LoRARequest(domain, lora_id, str(adapter_path))
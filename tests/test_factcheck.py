@@ -0,0 +1,112 @@
+"""
+Tests for FactCheckAgent's TF-IDF claim scoring.
+
+Run from the project root:
+    python -m pytest tests/test_factcheck.py
+"""
+
+import pytest
+
+pytest.importorskip("sklearn")
+
+from src.agents.factcheck import FactCheckAgent
+
+PASSAGES = [
+    {"text": "Solar panel installations doubled across Europe during 2023 according to industry reports."},
+    {"text": "Electric vehicle sales increased strongly in China, driven by government subsidies."},
+]
+
+SUPPORTED_ARGUMENT = (
+    "Solar panel installations doubled across Europe during 2023. "
+    "Electric vehicle sales increased strongly in China thanks to subsidies."
+)
+UNSUPPORTED_ARGUMENT = (
+    "Medieval castles attract thousands of curious tourists every summer. "
+    "Ancient pottery reveals surprising details about daily village routines."
+)
+
+
+@pytest.fixture
+def agent():
+    return FactCheckAgent()
+
+
+@pytest.fixture
+def passage_index(agent):
+    return agent.fit_passages(PASSAGES)
+
+
+def test_supported_claim_scores_high_and_unrelated_claim_scores_zero(agent, passage_index):
+    supported, unrelated = agent.score_claims(
+        [
+            "Solar panel installations doubled across Europe during 2023",
+            "Medieval castles attract thousands of curious tourists",
+        ],
+        passage_index,
+    )
+    assert supported > 0.7
+    assert unrelated == 0.0
+
+
+def test_claim_matching_a_passage_exactly_scores_one(agent, passage_index):
+    [score] = agent.score_claims([PASSAGES[1]["text"]], passage_index)
+    assert score == pytest.approx(1.0)
+
+
+def test_check_argument_separates_supported_and_unsupported(agent):
+    supported = agent.check_argument(SUPPORTED_ARGUMENT, [], PASSAGES)
+    unsupported = agent.check_argument(UNSUPPORTED_ARGUMENT, [], PASSAGES)
+
+    assert supported["num_claims"] == 2
+    assert supported["supported"] is True
+    assert supported["faithfulness_score"] == pytest.approx(supported["avg_support_score"] * 0.6)
+
+    assert unsupported["num_claims"] == 2
+    assert unsupported["supported"] is False
+    assert unsupported["avg_support_score"] == 0.0
+    assert unsupported["max_support_score"] == 0.0
+
+
+def test_source_coverage_adds_to_faithfulness(agent):
+    result = agent.check_argument(UNSUPPORTED_ARGUMENT, ["a", "b"], PASSAGES)
+    assert result["source_coverage"] == 1.0
+    assert result["faithfulness_score"] == pytest.approx(0.4)
+
+
+def test_batch_scores_match_per_argument_scoring(agent, passage_index):
+    claims = [
+        *agent._extract_claims(SUPPORTED_ARGUMENT),
+        *agent._extract_claims(UNSUPPORTED_ARGUMENT),
+    ]
+    batch = agent.score_claims(claims, passage_index)
+    single = [agent.score_claims([claim], passage_index)[0] for claim in claims]
+    assert batch == pytest.approx(single)
+
+    # Precomputed scores (as in process/streaming) give the same result
+    precomputed = agent.check_argument(
+        SUPPORTED_ARGUMENT, [], PASSAGES,
+        passage_index=passage_index,
+        claim_scores=batch[:2],
+    )
+    assert precomputed == agent.check_argument(SUPPORTED_ARGUMENT, [], PASSAGES)
+
+
+def test_partial_precomputed_scores_are_completed(agent, passage_index):
+    full = agent.check_argument(SUPPORTED_ARGUMENT, [], PASSAGES)
+    first = agent.score_claims(agent._extract_claims(SUPPORTED_ARGUMENT)[:1], passage_index)
+    partial = agent.check_argument(
+        SUPPORTED_ARGUMENT, [], PASSAGES,
+        passage_index=passage_index,
+        claim_scores=first,
+    )
+    assert partial == pytest.approx(full)
+
+
+def test_no_indexable_passages(agent):
+    assert agent.fit_passages([]) is None
+    assert agent.fit_passages([{"text": "the and of to a"}]) is None
+
+    result = agent.check_argument(SUPPORTED_ARGUMENT, [], [])
+    assert result["avg_support_score"] == 0.0
+    assert result["source_coverage"] == 0
+    assert result["supported"] is False